@@ -1,19 +1,713 @@
 from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse, PlainTextResponse
-from datetime import datetime
+from fastapi.routing import APIRoute
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from collections import OrderedDict
+from contextvars import Context, ContextVar
+from dataclasses import dataclass, field
+from functools import cached_property, wraps
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+import asyncio
+import hashlib
 import json
-import requests
+import math
+import os
+import random
+import sys
+import time
+import zlib
+import httpx
 from pythonping import ping
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 API_VERSION = "1.0.2"
 DOCS_URL = "/docs"
 
+THRONE_URL = os.getenv("THRONE_URL", "https://throne.com")
+EXCHANGE_RATE_URL = os.getenv("EXCHANGE_RATE_URL", "https://api.exchangerate-api.com/v4/latest")
+
+# Upstream HTTP client (timeouts in seconds)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+HTTP_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_KEEPALIVE_CONNECTIONS", str(HTTP_POOL_SIZE)))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "5"))
+HTTP_TOTAL_TIMEOUT = float(os.getenv("HTTP_TOTAL_TIMEOUT", "15"))
+
+# Upstream protection, applied separately to Throne and to the exchange rate API (timeouts in seconds)
+UPSTREAM_MAX_CONCURRENCY = int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "10"))
+UPSTREAM_QUEUE_TIMEOUT = float(os.getenv("UPSTREAM_QUEUE_TIMEOUT", "5"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+# Time allowed for all the upstream requests made on behalf of one incoming request, and retries of transient failures (in seconds)
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "25"))
+UPSTREAM_MAX_ATTEMPTS = int(os.getenv("UPSTREAM_MAX_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.25"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "5"))
+
+# Exchange rate table cache (TTL in seconds), every conversion is derived from a single USD table
+EXCHANGE_RATE_TTL = float(os.getenv("EXCHANGE_RATE_TTL", "3600"))
+EXCHANGE_RATE_MAX_STALE = float(os.getenv("EXCHANGE_RATE_MAX_STALE", "86400"))
+
+# Exchange rate providers, tried in order: "http" (EXCHANGE_RATE_URL), "file" (EXCHANGE_RATE_FILE) and "static" (EXCHANGE_RATE_STATIC)
+RATE_PROVIDERS = os.getenv("RATE_PROVIDERS", "http")
+EXCHANGE_RATE_FILE = os.getenv("EXCHANGE_RATE_FILE", "exchange_rates.json")
+EXCHANGE_RATE_STATIC = os.getenv("EXCHANGE_RATE_STATIC", '{"USD": 1}')
+
+# "data" reads Throne pages from their Next.js data routes, "html" always scrapes the HTML pages
+THRONE_FETCH_MODE = os.getenv("THRONE_FETCH_MODE", "data")
+
+# Creator snapshot cache (TTL in seconds)
+SNAPSHOT_CACHE_TTL = float(os.getenv("SNAPSHOT_CACHE_TTL", "60"))
+SNAPSHOT_CACHE_MAX_STALE = float(os.getenv("SNAPSHOT_CACHE_MAX_STALE", "300"))
+SNAPSHOT_CACHE_MAX_ENTRIES = int(os.getenv("SNAPSHOT_CACHE_MAX_ENTRIES", "256"))
+SNAPSHOT_CACHE_MAX_BYTES = int(os.getenv("SNAPSHOT_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+
+# Cache of failed lookups (unknown users, pages without data), TTL in seconds
+NEGATIVE_CACHE_TTL = float(os.getenv("NEGATIVE_CACHE_TTL", "30"))
+NEGATIVE_CACHE_MAX_ENTRIES = int(os.getenv("NEGATIVE_CACHE_MAX_ENTRIES", "4096"))
+
+# Strings shared by the cached snapshots of every creator (gifter names, image URLs, currencies...)
+INTERN_TABLE_MAX_ENTRIES = int(os.getenv("INTERN_TABLE_MAX_ENTRIES", "200000"))
+
+# Cache of rendered responses of the heaviest endpoints, dropped when the data they were computed from changes
+VIEW_CACHE_MAX_ENTRIES = int(os.getenv("VIEW_CACHE_MAX_ENTRIES", "1024"))
+VIEW_CACHE_MAX_BYTES = int(os.getenv("VIEW_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+def encode_unknown(value):
+    """Fail to render `value`, with the error of the field Throne left out if it is a `MissingField`."""
+    if isinstance(value, MissingField):
+        value.fail()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def json_dumps_stdlib(content):
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+                      default=encode_unknown).encode("utf-8")
+
+
+# JSON codec used to parse Throne pages and render responses, orjson when it is installed
+if orjson is not None:
+    JSON_BACKEND = "orjson"
+
+    def json_loads(data):
+        return orjson.loads(data)
+
+    def json_dumps(content):
+        try:
+            return orjson.dumps(content)
+        except orjson.JSONEncodeError:
+            # orjson doesn't tell which field Throne left out, the json module raises its error
+            return json_dumps_stdlib(content)
+else:
+    JSON_BACKEND = "json"
+
+    def json_loads(data):
+        return json.loads(data)
+
+    json_dumps = json_dumps_stdlib
+
+
+class FastJSONResponse(JSONResponse):
+    """`JSONResponse` rendered with the fastest available JSON codec."""
+
+    def render(self, content):
+        return json_dumps(content)
+
+
+class RenderedResponseRoute(APIRoute):
+    """
+    Route that flags the responses its endpoint builds itself as cacheable in the request context.
+
+    Endpoints report errors by returning an `HTTPException`, which FastAPI renders as a 200 response
+    that must not get an `ETag` nor be cached by clients.
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        @wraps(endpoint)
+        async def flag_rendered_response(*args, **params):
+            response = await endpoint(*args, **params)
+            context = request_context.get()
+            if context is not None and isinstance(response, Response):
+                context["cacheable"] = True
+            return response
+
+        super().__init__(path, flag_rendered_response, **kwargs)
+
+
 app = FastAPI(
     title="ThroneAPI",
     description="ThroneAPI is a FastAPI-based API for retrieving information about the Throne wishlist. It provides endpoints to fetch various details such as raw wishlist data, user information, collections, items, previous gifts, and more.",
     version=API_VERSION,
     docs_url=DOCS_URL,
+    default_response_class=FastJSONResponse,
 )
+app.router.route_class = RenderedResponseRoute
+
+http_client = None
+
+
+def get_http_client():
+    """
+    Return the shared upstream client, creating it on first use.
+
+    A single `httpx.AsyncClient` keeps connections to throne.com and the exchange rate API alive
+    between requests, and never blocks the event loop while waiting on them.
+    """
+    global http_client
+    if http_client is None or http_client.is_closed:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_SIZE,
+                max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(
+                HTTP_READ_TIMEOUT,
+                connect=HTTP_CONNECT_TIMEOUT,
+                pool=HTTP_POOL_TIMEOUT,
+            ),
+            follow_redirects=True,
+        )
+    return http_client
+
+
+async def with_total_timeout(aw, url):
+    """
+    Await `aw`, an upstream request to `url`, giving up once HTTP_TOTAL_TIMEOUT has elapsed or the deadline of the current request is reached.
+
+    Raises `httpx.TimeoutException` when the total timeout is hit, so callers only have to handle `httpx.HTTPError`.
+    """
+    timeout = remaining_time(HTTP_TOTAL_TIMEOUT)
+    try:
+        return await asyncio.wait_for(aw, max(timeout, 0))
+    except asyncio.TimeoutError:
+        count_upstream_event("upstream_timeouts")
+        if timeout < HTTP_TOTAL_TIMEOUT:
+            raise httpx.TimeoutException(f"Request deadline reached fetching {url}") from None
+        raise httpx.TimeoutException(f"Timed out after {HTTP_TOTAL_TIMEOUT}s fetching {url}") from None
+    except httpx.TimeoutException:
+        count_upstream_event("upstream_timeouts")
+        raise
+
+
+class UpstreamUnavailableError(httpx.TransportError):
+    """Raised instead of contacting an upstream that is overloaded or whose circuit breaker is open."""
+
+
+class UpstreamGuard:
+    """
+    Concurrency limit and circuit breaker for one upstream.
+
+    At most `max_concurrency` requests are in flight at once, and a request waiting more than
+    `queue_timeout` seconds for its turn is given up. After `failure_threshold` consecutive failures
+    (transport errors, 429 and 5xx answers) the circuit opens and requests fail right away. Once
+    `reset_timeout` seconds have passed, a single probe request is let through: the circuit closes
+    again if it succeeds and stays open for another `reset_timeout` if it fails.
+    """
+
+    def __init__(self, name, max_concurrency, queue_timeout, failure_threshold, reset_timeout):
+        self.name = name
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.queue_timeout = queue_timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def is_open(self):
+        """Return True while requests are refused, half-open included."""
+        return self.opened_at is not None
+
+    def before_request(self):
+        """Raise if the circuit is open, and return True if the request is the probe of a half-open circuit."""
+        if self.opened_at is None:
+            return False
+        if self.probing or time.monotonic() - self.opened_at < self.reset_timeout:
+            raise UpstreamUnavailableError(f"{self.name} is unavailable, its circuit breaker is open")
+        self.probing = True
+        return True
+
+    def record(self, success, probe):
+        if probe:
+            self.probing = False
+        if success:
+            if self.opened_at is not None:
+                print(f"{self.name} is reachable again, closing its circuit breaker")
+            self.failures = 0
+            self.opened_at = None
+        else:
+            self.failures += 1
+            if probe or (self.opened_at is None and self.failures >= self.failure_threshold):
+                if self.opened_at is None:
+                    print(f"{self.name} failed {self.failures} times in a row, opening its circuit breaker")
+                self.opened_at = time.monotonic()
+
+    async def run(self, request):
+        """
+        Await `request()`, an upstream request, once the circuit breaker and the concurrency limit allow it.
+
+        Raises `UpstreamUnavailableError` without calling `request` if the circuit is open or no slot frees up in time.
+        """
+        probe = False
+        try:
+            probe = self.before_request()
+            try:
+                await asyncio.wait_for(self.semaphore.acquire(), max(remaining_time(self.queue_timeout), 0))
+            except asyncio.TimeoutError:
+                raise UpstreamUnavailableError(f"Too many requests to {self.name} in flight, gave up waiting after {self.queue_timeout}s") from None
+        except BaseException:
+            if probe:
+                self.probing = False
+            raise
+
+        try:
+            result = await request()
+        except httpx.HTTPStatusError as e:
+            self.record(not is_upstream_failure(e.response.status_code), probe)
+            raise
+        except httpx.TransportError:
+            self.record(False, probe)
+            raise
+        except BaseException:
+            # Not the upstream's fault (cancelled...), let another probe through if needed
+            if probe:
+                self.probing = False
+            raise
+        finally:
+            self.semaphore.release()
+
+        self.record(not (isinstance(result, httpx.Response) and is_upstream_failure(result.status_code)), probe)
+        return result
+
+
+def is_upstream_failure(status_code):
+    return status_code == 429 or status_code >= 500
+
+
+throne_guard = UpstreamGuard("Throne", UPSTREAM_MAX_CONCURRENCY, UPSTREAM_QUEUE_TIMEOUT, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
+rate_guard = UpstreamGuard("The exchange rate API", UPSTREAM_MAX_CONCURRENCY, UPSTREAM_QUEUE_TIMEOUT, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
+
+
+def guard_for(url):
+    return throne_guard if url.startswith(THRONE_URL) else rate_guard
+
+
+# Answers worth retrying, the upstream is expected to answer differently a bit later
+RETRY_STATUS_CODES = {429, 502, 503}
+
+
+def retry_delay(attempt, response=None):
+    """
+    Return how many seconds to wait before retrying an upstream request that failed on its `attempt` (from 0), or None to give up.
+
+    The delay is the one asked by the `Retry-After` header of `response` if any, and a jittered
+    exponential backoff otherwise. The request is given up when it was the last allowed attempt or
+    when the delay would go past the deadline of the current request.
+    """
+    if attempt + 1 >= UPSTREAM_MAX_ATTEMPTS:
+        return None
+
+    delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            delay = max(float(retry_after), 0)
+        except ValueError:
+            try:
+                delay = max((parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds(), 0)
+            except (TypeError, ValueError):
+                pass
+
+    if delay >= remaining_time(math.inf):
+        return None
+    return delay
+
+
+async def send_upstream(url, request):
+    """
+    Await `request()`, an upstream request to `url`, within the limits of the guard of its upstream, retrying transient failures.
+
+    Connection errors and 429, 502 and 503 answers are retried, up to UPSTREAM_MAX_ATTEMPTS attempts in all.
+    """
+    guard = guard_for(url)
+    attempt = 0
+    while True:
+        try:
+            result = await guard.run(request)
+        except httpx.HTTPStatusError as e:
+            delay = retry_delay(attempt, e.response) if e.response.status_code in RETRY_STATUS_CODES else None
+            if delay is None:
+                raise
+        except (httpx.NetworkError, httpx.RemoteProtocolError):
+            delay = retry_delay(attempt)
+            if delay is None:
+                raise
+        else:
+            retryable = isinstance(result, httpx.Response) and result.status_code in RETRY_STATUS_CODES
+            delay = retry_delay(attempt, result) if retryable else None
+            if delay is None:
+                return result
+
+        count_upstream_event("upstream_retries")
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def upstream_get(url, headers=None):
+    """GET `url` with the shared client."""
+    return await send_upstream(url, lambda: with_total_timeout(get_http_client().get(url, headers=headers), url))
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    if http_client is not None:
+        await http_client.aclose()
+
+
+NEXT_DATA_START_MARKER = b'<script id="__NEXT_DATA__" type="application/json">'
+NEXT_DATA_END_MARKER = b'</script>'
+
+
+async def extract_next_data(chunks):
+    """
+    Return the bytes of the `__NEXT_DATA__` script found in `chunks`, an async iterator of bytes.
+
+    The markers are matched across chunk boundaries, and reading stops as soon as the end marker
+    is seen. Only the JSON itself is buffered. Returns `b""` if the script is missing.
+    """
+    buffer = bytearray()
+    found_start = False
+    search_from = 0
+
+    async for chunk in chunks:
+        buffer += chunk
+
+        if not found_start:
+            start_index = buffer.find(NEXT_DATA_START_MARKER)
+            if start_index < 0:
+                # Only keep what could be the beginning of a start marker split across chunks
+                del buffer[:-(len(NEXT_DATA_START_MARKER) - 1)]
+                continue
+            del buffer[:start_index + len(NEXT_DATA_START_MARKER)]
+            found_start = True
+
+        end_index = buffer.find(NEXT_DATA_END_MARKER, search_from)
+        if end_index >= 0:
+            return bytes(buffer[:end_index])
+        search_from = max(0, len(buffer) - len(NEXT_DATA_END_MARKER) + 1)
+
+    return b""
+
+
+async def stream_next_data(throne_url):
+    async with get_http_client().stream("GET", throne_url) as r:
+        r.raise_for_status()
+        # Leaving the block before the body is fully read closes the connection
+        return await extract_next_data(r.aiter_bytes())
+
+
+async def download_next_data(throne_url):
+    """Download a Throne page and return the raw bytes of its `__NEXT_DATA__` script."""
+    return await send_upstream(throne_url, lambda: with_total_timeout(stream_next_data(throne_url), throne_url))
+
+
+async def fetch_next_data(throne_url):
+    """
+    Download a Throne page and return the parsed content of its `__NEXT_DATA__` script.
+
+    Raises `httpx.HTTPError` if the page can't be downloaded and `json.JSONDecodeError` if it holds no usable JSON.
+    """
+    return json_loads(await download_next_data(throne_url))
+
+
+# Build ID of the Throne website, learnt from the last HTML page scraped in "data" fetch mode
+throne_build_id = None
+
+
+async def fetch_page_props(page_path):
+    """
+    Return the parsed `pageProps` of the Throne page at `page_path`.
+
+    In "data" fetch mode they are read from the Next.js data route of the page, which serves them as
+    plain JSON. When the build ID isn't known yet, or the data route answers 404 because Throne
+    deployed a new build, the HTML page is scraped instead and the build ID is read from it.
+    Raises `httpx.HTTPError` if the page can't be downloaded and `json.JSONDecodeError` if it holds no usable JSON.
+    """
+    global throne_build_id
+
+    if THRONE_FETCH_MODE == "data" and throne_build_id is not None:
+        data_url = f"{THRONE_URL}/_next/data/{throne_build_id}{page_path}.json"
+        response = await upstream_get(data_url, headers={"x-nextjs-data": "1"})
+        if response.status_code != 404:
+            response.raise_for_status()
+            return json_loads(response.content)["pageProps"]
+
+    json_data = await download_next_data(f"{THRONE_URL}{page_path}")
+    next_data = json_loads(json_data)
+    if THRONE_FETCH_MODE == "data":
+        throne_build_id = next_data.get("buildId")
+    return next_data["props"]["pageProps"]
+
+
+@dataclass
+class CacheEntry:
+    value: object
+    size: int
+    stored_at: float
+
+    @property
+    def age(self):
+        return time.monotonic() - self.stored_at
+
+
+class SnapshotCache:
+    """
+    In-memory LRU cache, used for creator snapshots, exchange rate tables and rendered responses.
+
+    Entries are fresh for `ttl` seconds after being stored, then stale for `max_stale` more seconds
+    before they are dropped. The least recently used entries are evicted once the cache holds more
+    than `max_entries` entries or more than `max_bytes` bytes.
+    """
+
+    def __init__(self, ttl, max_stale, max_entries, max_bytes):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+
+    def get(self, key, keep_expired=False):
+        """
+        Return the entry stored under `key`, or None if there is none or it is past its max stale age.
+
+        With `keep_expired`, entries past their max stale age are returned instead of dropped.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.age >= self.ttl + self.max_stale and not keep_expired:
+            self.invalidate(key)
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def is_fresh(self, entry):
+        return entry.age < self.ttl
+
+    def set(self, key, value, size):
+        self.invalidate(key)
+        if self.ttl <= 0 or size > self.max_bytes:
+            return
+        self.entries[key] = CacheEntry(value, size, time.monotonic())
+        self.size += size
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= evicted.size
+
+    def invalidate(self, key=None):
+        if key is None:
+            self.entries.clear()
+            self.size = 0
+            return
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+
+# A user takes two entries, one for their gifters page and one for their wishlist page
+snapshot_cache = SnapshotCache(SNAPSHOT_CACHE_TTL, SNAPSHOT_CACHE_MAX_STALE, 2 * SNAPSHOT_CACHE_MAX_ENTRIES, SNAPSHOT_CACHE_MAX_BYTES)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into a single execution.
+
+    While a call for a key is in flight, later calls for the same key wait for it and get the same
+    result or exception. A caller being cancelled does not cancel the shared call.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        # Request context of every call in flight, where its upstream retries and timeouts are counted
+        self.contexts = {}
+
+    def start(self, key, fn, *args):
+        """
+        Start `fn(*args)` unless a call for `key` is already in flight, and return the task of the call.
+
+        The call runs outside of the request that started it, with a deadline of its own, so that it
+        isn't cut short by the deadline of that request when other callers are waiting for it.
+        """
+        task = self.calls.get(key)
+        if task is None:
+            shared_context = {"deadline": time.monotonic() + REQUEST_DEADLINE}
+            context = Context()
+            context.run(request_context.set, shared_context)
+            task = asyncio.get_running_loop().create_task(fn(*args), context=context)
+            self.calls[key] = task
+            self.contexts[key] = shared_context
+            task.add_done_callback(lambda done: self.forget(key, done))
+        return task
+
+    def forget(self, key, task):
+        if self.calls.get(key) is task:
+            del self.calls[key]
+            del self.contexts[key]
+        # The exception has been raised to the callers, even if they all stopped waiting for it
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key, fn, *args):
+        """
+        Return the result of `fn(*args)`, sharing the call with the concurrent callers for `key`.
+
+        Waiting stops at the deadline of the current request, raising `httpx.TimeoutException`, while
+        the call goes on for the other callers. The upstream retries and timeouts of the call are
+        added to the counters of every caller.
+        """
+        task = self.start(key, fn, *args)
+        shared_context = self.contexts[key]
+        timeout = remaining_time(REQUEST_DEADLINE)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), max(timeout, 0))
+        except asyncio.TimeoutError:
+            count_upstream_event("upstream_timeouts")
+            raise httpx.TimeoutException(f"Request deadline reached waiting for {key}") from None
+        finally:
+            for counter in ("upstream_retries", "upstream_timeouts"):
+                count_upstream_event(counter, shared_context.get(counter, 0))
+
+
+throne_fetches = SingleFlight()
+rate_fetches = SingleFlight()
+
+
+# Per-request state shared between the endpoints and the middleware that builds response headers
+request_context = ContextVar("request_context", default=None)
+
+
+@app.middleware("http")
+async def add_cache_headers(request, call_next):
+    context = {"deadline": time.monotonic() + REQUEST_DEADLINE}
+    token = request_context.set(context)
+    try:
+        response = await call_next(request)
+    finally:
+        request_context.reset(token)
+
+    # Responses computed from cached data are the same as long as that data and the query are
+    if request.method == "GET" and response.status_code == 200 and context.get("cacheable") and "data_versions" in context:
+        etag = '"' + content_version(json_dumps([request.url.path, request.url.query, sorted(context["data_versions"].items())])) + '"'
+        if etag_matches(etag, request.headers.get("If-None-Match", "")):
+            response = Response(status_code=304)
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = formatdate(context["fetched_at"], usegmt=True)
+        response.headers["Cache-Control"] = f"public, max-age={int(SNAPSHOT_CACHE_TTL)}, stale-while-revalidate={int(SNAPSHOT_CACHE_MAX_STALE)}"
+
+    if "snapshot_age" in context:
+        response.headers["Age"] = str(int(context["snapshot_age"]))
+        response.headers["X-Cache"] = context["cache_status"]
+    response.headers["X-Upstream-Retries"] = str(context.get("upstream_retries", 0))
+    response.headers["X-Upstream-Timeouts"] = str(context.get("upstream_timeouts", 0))
+    return response
+
+
+CACHE_STATUS_PRIORITY = {"HIT": 0, "STALE": 1, "MISS": 2}
+
+
+def record_snapshot_age(age, cache_status):
+    """
+    Remember how old the snapshot data used by the current request is, for the `Age` and `X-Cache` headers.
+
+    When a request uses several pieces of data, the oldest age and the worst cache status are reported.
+    """
+    context = request_context.get()
+    if context is not None:
+        context["snapshot_age"] = max(age, context.get("snapshot_age", 0))
+        if CACHE_STATUS_PRIORITY[cache_status] >= CACHE_STATUS_PRIORITY[context.get("cache_status", "HIT")]:
+            context["cache_status"] = cache_status
+
+
+def record_data_version(name, version, fetched_at):
+    """
+    Remember the content version and fetch time of the data `name` used by the current request, for
+    the `ETag` and `Last-Modified` headers.
+    """
+    context = request_context.get()
+    if context is not None:
+        context.setdefault("data_versions", {})[name] = version
+        context["fetched_at"] = max(fetched_at, context.get("fetched_at", 0))
+
+
+def remember_failure(name, error):
+    """Remember that loading the data `name` failed with `error` during the current request, so that it isn't fetched again."""
+    context = request_context.get()
+    if context is not None:
+        context.setdefault("failed_loads", {})[name] = error
+
+
+def remembered_failure(name):
+    """Return the error loading the data `name` failed with earlier in the current request, or None."""
+    context = request_context.get()
+    if context is None:
+        return None
+    return context.get("failed_loads", {}).get(name)
+
+
+def etag_matches(etag, if_none_match):
+    """Tell whether the value of an `If-None-Match` header matches `etag`, with the weak comparison it calls for."""
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def remaining_time(timeout):
+    """Return `timeout`, cut down to the time left before the deadline of the current request."""
+    context = request_context.get()
+    if context is None:
+        return timeout
+    return min(timeout, context["deadline"] - time.monotonic())
+
+
+def count_upstream_event(counter, count=1):
+    """Count upstream retries or timeouts for the `X-Upstream-Retries` and `X-Upstream-Timeouts` headers."""
+    context = request_context.get()
+    if context is not None:
+        context[counter] = context.get(counter, 0) + count
+
+
+def report_refresh_error(task):
+    if not task.cancelled() and task.exception() is not None:
+        print(f"An error occurred while refreshing cached data: {task.exception()}")
+
+
+async def gather_or_cancel(*aws):
+    """
+    Run awaitables concurrently and return their results in order.
+
+    Unlike a bare `asyncio.gather`, the first failure cancels the awaitables that are still running
+    instead of leaving them to finish in the background.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
 
 
 @app.get("/rawData/Gifted", tags=["Raw"],
@@ -57,21 +751,12 @@ async def get_raw_gifted(
     }
     ```
     """
-    throne_url = f"https://throne.com/{username.lower()}/gifters"
+    throne_url = f"{THRONE_URL}/{username.lower()}/gifters"
     try:
-        r = requests.get(throne_url)
-        r.raise_for_status()
+        parsed_data = await fetch_next_data(throne_url)
+        return FastJSONResponse(parsed_data, status_code=200)
 
-        start_marker = '<script id="__NEXT_DATA__" type="application/json">'
-        end_marker = '</script>'
-        start_index = r.text.find(start_marker) + len(start_marker)
-        end_index = r.text.find(end_marker, start_index)
-        json_data = r.text[start_index:end_index]
-
-        parsed_data = json.loads(json_data)
-        return JSONResponse(parsed_data, status_code=200)
-
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         return HTTPException(status_code=500, detail=str(e))
 
     except json.JSONDecodeError:
@@ -129,21 +814,12 @@ async def get_raw_wishlist(
     }
     ```
     """
-    throne_url = f"https://throne.com/{username.lower()}"
+    throne_url = f"{THRONE_URL}/{username.lower()}"
     try:
-        r = requests.get(throne_url)
-        r.raise_for_status()
+        parsed_data = await fetch_next_data(throne_url)
+        return FastJSONResponse(parsed_data, status_code=200)
 
-        start_marker = '<script id="__NEXT_DATA__" type="application/json">'
-        end_marker = '</script>'
-        start_index = r.text.find(start_marker) + len(start_marker)
-        end_index = r.text.find(end_marker, start_index)
-        json_data = r.text[start_index:end_index]
-
-        parsed_data = json.loads(json_data)
-        return JSONResponse(parsed_data, status_code=200)
-
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         error_message = f"Throne API Request Error: {str(e)}"
         return HTTPException(status_code=500, detail=error_message)
 
@@ -152,6 +828,746 @@ async def get_raw_wishlist(
         return PlainTextResponse(error_message, status_code=500)
 
 
+# Sections of a creator snapshot, each one read from its own Throne page
+GIFTERS_SECTION = "gifters"
+WISHLIST_SECTION = "wishlist"
+ALL_SECTIONS = (GIFTERS_SECTION, WISHLIST_SECTION)
+
+
+class InternTable:
+    """
+    Bounded table of strings, so that equal strings read from different pages share one object.
+
+    The least recently used strings are forgotten once the table holds more than `max_entries`
+    strings, which only means later copies of them aren't shared with the earlier ones.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.strings = OrderedDict()
+        self.hits = 0
+        # Bytes of the copies replaced by a string of the table since startup, sections keep their share of it
+        self.interned_bytes_total = 0
+
+    def intern(self, value):
+        """Return the string of the table equal to `value`, adding `value` if there is none. Anything else is returned as is."""
+        if not isinstance(value, str):
+            return value
+        interned = self.strings.get(value)
+        if interned is None:
+            self.strings[value] = value
+            if len(self.strings) > self.max_entries:
+                self.strings.popitem(last=False)
+            return value
+        self.strings.move_to_end(value)
+        if interned is not value:
+            self.hits += 1
+            self.interned_bytes_total += sys.getsizeof(value)
+        return interned
+
+
+string_table = InternTable(INTERN_TABLE_MAX_ENTRIES)
+
+
+class MissingField:
+    """
+    Value of a field Throne left out of a record.
+
+    Using it in any way raises the `KeyError` reading the field from the JSON raised, so only the
+    endpoints that need the field fail, instead of every endpoint reading the page.
+    """
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"MissingField({self.name!r})"
+
+    def fail(self, *args):
+        raise KeyError(self.name)
+
+    __getattr__ = __bool__ = __hash__ = __eq__ = __ne__ = __lt__ = __le__ = __gt__ = __ge__ = fail
+    __add__ = __radd__ = __sub__ = __rsub__ = __mul__ = __rmul__ = __truediv__ = __rtruediv__ = __neg__ = fail
+    __int__ = __float__ = __index__ = __round__ = __str__ = __format__ = __iter__ = __len__ = fail
+
+
+def optional_field(data, key):
+    """Return the field `key` of `data`, or a `MissingField` if Throne left it out."""
+    return data.get(key) if key in data else MissingField(key)
+
+
+# Compact records of the Throne data the endpoints read, built when a page is ingested so the
+# fields that are never read aren't kept in the cache. Amounts stay in cents, timestamps in milliseconds.
+# Only the fields every endpoint reading the records needs are required, the others are `MissingField`
+# when Throne leaves them out.
+@dataclass(slots=True)
+class Money:
+    """Amounts of a gift in one currency. Throne leaves `fees`, `sub_total` and `total` empty at times."""
+    currency: str
+    price: int
+    fees: int
+    sub_total: int
+    shipping: int
+    total: int
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(string_table.intern(optional_field(data, "currency")),
+                   *(optional_field(data, key) for key in ("price", "fees", "subTotal", "shipping", "total")))
+
+
+@dataclass(slots=True)
+class Customer:
+    """A gifter who took part in a gift."""
+    username: str
+    image: str
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(string_table.intern(data["customerUsername"]), string_table.intern(optional_field(data, "customerImage")))
+
+
+@dataclass(slots=True)
+class Gift:
+    id: str
+    name: str
+    purchased_at: int
+    status: str
+    is_complete: bool
+    is_digital: bool
+    is_crowdfunded: bool
+    image: str
+    link: str
+    total: Money
+    total_usd: Money
+    customers: tuple
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(
+            data["id"], data["name"], optional_field(data, "purchasedAt"), string_table.intern(optional_field(data, "status")),
+            optional_field(data, "isComplete"), optional_field(data, "isDigitalGood"), optional_field(data, "isCrowdfunded"),
+            optional_field(data, "imageSrc"), data.get("link", None),
+            Money.from_json(data["total"]) if "total" in data else MissingField("total"),
+            Money.from_json(data["totalUsd"]) if "totalUsd" in data else MissingField("totalUsd"),
+            tuple(Customer.from_json(customer) for customer in data["customizations"]["customers"]),
+        )
+
+
+@dataclass(slots=True)
+class WishlistItem:
+    id: str
+    name: str
+    quantity: int
+    price: int
+    currency: str
+    shipping: int
+    collection_ids: tuple
+    created_at: int
+    is_digital: bool
+    is_available: bool
+    not_in_stock: bool
+    image: str
+    link: str
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(
+            data["id"], data["name"], optional_field(data, "quantity"), optional_field(data, "price"),
+            string_table.intern(optional_field(data, "currency")), data.get("shipping", 0),
+            tuple(data["collectionIds"]) if "collectionIds" in data else MissingField("collectionIds"),
+            optional_field(data, "createdAt"), optional_field(data, "isDigitalGood"),
+            data.get("isAvailable", None), data.get("notInStock", None), optional_field(data, "imgLink"), data.get("link", None),
+        )
+
+
+@dataclass(slots=True)
+class Collection:
+    id: str
+    title: str
+    description: str
+    created_at: int
+    updated_at: int
+    image: str
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["id"], data["title"], *(optional_field(data, key) for key in ("description", "createdAt", "updatedAt", "imageSrc")))
+
+
+def measure_size(value, seen=None):
+    """
+    Return how many bytes `value` uses, with the records, containers and strings it references.
+
+    Objects referenced several times are only counted once, and strings of the intern table, which
+    are shared between snapshots, aren't counted.
+    """
+    if seen is None:
+        seen = set()
+    if id(value) in seen or (isinstance(value, str) and string_table.strings.get(value) is value):
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(measure_size(key, seen) + measure_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(measure_size(item, seen) for item in value)
+    elif hasattr(value, "__slots__"):
+        size += sum(measure_size(getattr(value, name), seen) for name in value.__slots__)
+    return size
+
+
+def estimate_list_size(records, sample_size=100):
+    """Return roughly how many bytes the list `records` uses, measuring a sample of evenly spaced records only."""
+    if not records:
+        return sys.getsizeof(records)
+    sample = records[::max(1, len(records) // sample_size)]
+    return sys.getsizeof(records) + len(records) * sum(measure_size(record) for record in sample) // len(sample)
+
+
+@dataclass
+class GiftersSection:
+    """
+    Data read from the `/gifters` page of a creator.
+
+    The indexes are built the first time they are used and live as long as the cached section.
+    """
+    initial_counts: dict
+    user_info: dict
+    previous_gifts: list
+    leaderboard: dict
+    version: str = ""
+    fetched_at: float = 0
+    # Bytes of the strings of the section shared with the intern table instead of being copies
+    interned_bytes: int = 0
+    # Every field of the page for `/get_cleaned`, as zlib-compressed JSON, far smaller than the parsed JSON
+    raw_json_zlib: bytes = zlib.compress(b"{}")
+
+    def size(self):
+        """Approximate memory used by the section, not counting its indexes."""
+        return (estimate_list_size(self.previous_gifts) + measure_size([self.initial_counts, self.user_info, self.leaderboard])
+                + sys.getsizeof(self.raw_json_zlib))
+
+    @cached_property
+    def gifts_by_id(self):
+        # Built in reverse so that the first gift wins when IDs are duplicated, like a linear search
+        return {gift.id: gift for gift in reversed(self.previous_gifts)}
+
+    @cached_property
+    def gifts_by_gifter(self):
+        """Gifts of every gifter username, in the order of `previous_gifts`."""
+        index = {}
+        for gift in self.previous_gifts:
+            for gifter_username in dict.fromkeys(gifter.username for gifter in gift.customers):
+                index.setdefault(gifter_username, []).append(gift)
+        return index
+
+    def gifter_stats(self, gifter_username, image=None):
+        """Return the `GifterStats` of `gifter_username`, counting every gift they took part in once."""
+        stats = GifterStats(gifter_username, image)
+        for gift in self.gifts_by_gifter.get(gifter_username, []):
+            stats.add(gift)
+        return stats
+
+    @cached_property
+    def gift_columns(self):
+        return GiftColumns(self.previous_gifts)
+
+    @cached_property
+    def gifts_by_date(self):
+        """Gifts sorted from the latest purchased to the oldest, gifts purchased at the same time keep their order."""
+        return sorted(self.previous_gifts, key=lambda gift: gift.purchased_at, reverse=True)
+
+
+@dataclass
+class WishlistSection:
+    """
+    Data read from the wishlist page of a creator.
+
+    The indexes are built the first time they are used and live as long as the cached section.
+    """
+    wishlist_items: list
+    wishlist_collections: list
+    version: str = ""
+    fetched_at: float = 0
+    # Bytes of the strings of the section shared with the intern table instead of being copies
+    interned_bytes: int = 0
+    # Same as for the gifters page
+    raw_json_zlib: bytes = zlib.compress(b"{}")
+
+    def size(self):
+        """Approximate memory used by the section, not counting its indexes."""
+        return (estimate_list_size(self.wishlist_items) + estimate_list_size(self.wishlist_collections)
+                + sys.getsizeof(self.raw_json_zlib))
+
+    @cached_property
+    def items_by_id(self):
+        return {item.id: item for item in reversed(self.wishlist_items)}
+
+    @cached_property
+    def collections_by_id(self):
+        return {collection.id: collection for collection in reversed(self.wishlist_collections)}
+
+    @cached_property
+    def items_by_collection(self):
+        """Items of every collection ID, in the order of `wishlist_items`."""
+        index = {}
+        for item in self.wishlist_items:
+            for collection_id in dict.fromkeys(item.collection_ids):
+                index.setdefault(collection_id, []).append(item)
+        return index
+
+    @cached_property
+    def collection_totals(self):
+        """`CollectionTotals` of every collection ID that holds items."""
+        totals = {}
+        for collection_id, items in self.items_by_collection.items():
+            collection_totals = totals[collection_id] = CollectionTotals()
+            for item in items:
+                collection_totals.add(item)
+        return totals
+
+
+@dataclass
+class CollectionTotals:
+    """Number of items in a collection and their value in each of their currencies, in cents."""
+    items: int = 0
+    individual_items: int = 0
+    price_cents: dict = field(default_factory=dict)
+
+    def add(self, item):
+        self.individual_items += 1
+        self.items += item.quantity
+        self.price_cents[item.currency] = self.price_cents.get(item.currency, 0) + item.price * item.quantity
+
+    def prices(self):
+        return {currency: cents / 100 for currency, cents in self.price_cents.items()}
+
+
+@dataclass
+class CreatorSnapshot:
+    """Cleaned Throne data of a creator. Only the sections requested from `load_snapshot` are set."""
+    gifters: GiftersSection = None
+    wishlist: WishlistSection = None
+
+    @property
+    def initial_counts(self):
+        return self.gifters.initial_counts
+
+    @property
+    def user_info(self):
+        return self.gifters.user_info
+
+    @property
+    def previous_gifts(self):
+        return self.gifters.previous_gifts
+
+    @property
+    def leaderboard(self):
+        return self.gifters.leaderboard
+
+    @property
+    def wishlist_items(self):
+        return self.wishlist.wishlist_items
+
+    @property
+    def wishlist_collections(self):
+        return self.wishlist.wishlist_collections
+
+
+def content_version(encoded):
+    """Return a short hash of the bytes `encoded`, such as JSON rendered by `json_dumps`, which changes whenever they do."""
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def read_gifters_page(username, page_props):
+    """Return the raw data of the `/gifters` page of `username`, keyed like in the response of `/get_cleaned`."""
+    fallback = page_props["fallback"]
+    _userInfo = fallback[f"public/useCreatorByUsername/{username}"]
+    return {
+        "initialCounts": page_props["initialCounts"],
+        "userInfo": _userInfo,
+        "previousGifts": fallback[f"public/wishlist/usePreviousGifts/{_userInfo['_id']}"],
+        "leaderboard": fallback[f"api-leaderboard/v1/leaderboard/{_userInfo['_id']}"],
+    }
+
+
+def read_wishlist_page(user_id, page_props):
+    """Return the raw data of the wishlist page of the creator `user_id`, keyed like in the response of `/get_cleaned`."""
+    fallback = page_props["fallback"]
+    return {
+        "wishlistItems": fallback[f"public/wishlist/useWishlistItems/{user_id}"],
+        "wishlistCollections": fallback[f"public/wishlist/useWishlistCollections/{user_id}"],
+    }
+
+
+@dataclass
+class GifterStats:
+    """What a gifter gave, summed in USD cents, and their latest gift."""
+    username: str
+    image: str
+    latest_gift: dict = None
+    nb_gifts: int = 0
+    usd_price: int = 0
+    usd_fees: int = 0
+    usd_subtotal: int = 0
+    usd_shipping: int = 0
+    usd_total: int = 0
+
+    def add(self, gift):
+        total_usd = gift.total_usd
+        self.nb_gifts += 1
+        self.usd_price += total_usd.price
+        self.usd_fees += total_usd.fees or 0
+        self.usd_subtotal += total_usd.sub_total or 0
+        self.usd_shipping += total_usd.shipping
+        self.usd_total += total_usd.total or 0
+        # Raw timestamps in milliseconds, formatting only happens once the latest gift is known
+        if self.latest_gift is None or gift.purchased_at > self.latest_gift.purchased_at:
+            self.latest_gift = gift
+
+    def summary(self):
+        return {
+            "nbGifts": self.nb_gifts,
+            "usd_price": self.usd_price/100,
+            "usd_fees": 0 if not self.usd_fees else self.usd_fees/100,
+            "usd_subtotal": 0 if not self.usd_subtotal else self.usd_subtotal/100,
+            "usd_shipping": self.usd_shipping/100,
+            "usd_total": 0 if not self.usd_total else self.usd_total/100,
+        }
+
+
+def aggregate_gifters(previous_gifts):
+    """Return the `GifterStats` of every gifter of `previous_gifts` by username, in the order of their first gift, in a single pass."""
+    stats = {}
+    for gift in previous_gifts:
+        for gifter in gift.customers:
+            gifter_stats = stats.get(gifter.username)
+            if gifter_stats is None:
+                gifter_stats = GifterStats(gifter.username, gifter.image)
+                stats[gifter.username] = gifter_stats
+            gifter_stats.add(gift)
+    return stats
+
+
+GIFT_AMOUNT_FIELDS = {"price": "price", "fees": "fees", "subtotal": "sub_total", "shipping": "shipping", "total": "total"}
+
+
+class GiftColumns:
+    """
+    Columnar form of a gift history, for totals and per-gifter group-bys.
+
+    Holds the USD amounts of every gift in integer cents, their purchase timestamps, and one
+    (gift, gifter code) pair per customer of every gift. Columns are NumPy arrays when NumPy is
+    installed and the reductions are vectorized, they are plain lists reduced in Python otherwise.
+    Both give the same results.
+    """
+
+    def __init__(self, previous_gifts):
+        self.gifts = previous_gifts
+        self.gifter_codes = {}
+        self.gifter_images = []
+        amounts = {name: [] for name in GIFT_AMOUNT_FIELDS}
+        purchased_at = []
+        member_gifts = []
+        member_gifters = []
+
+        for index, gift in enumerate(previous_gifts):
+            for name, key in GIFT_AMOUNT_FIELDS.items():
+                amounts[name].append(getattr(gift.total_usd, key) or 0)
+            purchased_at.append(gift.purchased_at)
+            for gifter in gift.customers:
+                code = self.gifter_codes.get(gifter.username)
+                if code is None:
+                    # Codes follow the order in which gifters first appear
+                    code = self.gifter_codes[gifter.username] = len(self.gifter_images)
+                    self.gifter_images.append(gifter.image)
+                member_gifts.append(index)
+                member_gifters.append(code)
+
+        if np is not None:
+            amounts = {name: np.array(column, dtype=np.int64) for name, column in amounts.items()}
+            purchased_at = np.array(purchased_at, dtype=np.int64)
+            member_gifts = np.array(member_gifts, dtype=np.intp)
+            member_gifters = np.array(member_gifters, dtype=np.intp)
+        self.amounts = amounts
+        self.purchased_at = purchased_at
+        self.member_gifts = member_gifts
+        self.member_gifters = member_gifters
+
+    def totals(self):
+        """Return the sum of every USD amount over all the gifts, in cents."""
+        return {name: int(sum(column) if np is None else column.sum()) for name, column in self.amounts.items()}
+
+    def gifter_stats(self):
+        """Return the `GifterStats` of every gifter, in the order of their first gift, like `aggregate_gifters`."""
+        if np is None or not self.gifter_images:
+            return list(aggregate_gifters(self.gifts).values())
+
+        n_gifters = len(self.gifter_images)
+        # Integer cents stay exact in the float64 sums of bincount up to 2**53
+        counts = np.bincount(self.member_gifters, minlength=n_gifters).tolist()
+        sums = {
+            name: np.bincount(self.member_gifters, weights=column[self.member_gifts], minlength=n_gifters).astype(np.int64).tolist()
+            for name, column in self.amounts.items()
+        }
+        # Sort the pairs by gifter then latest purchase first, the stable sort keeps the first of equally recent gifts
+        order = np.lexsort((-self.purchased_at[self.member_gifts], self.member_gifters))
+        firsts = np.searchsorted(self.member_gifters[order], np.arange(n_gifters))
+        latest_gifts = self.member_gifts[order[firsts]].tolist()
+
+        return [
+            GifterStats(
+                username, self.gifter_images[code], self.gifts[latest_gifts[code]], counts[code],
+                sums["price"][code], sums["fees"][code], sums["subtotal"][code], sums["shipping"][code], sums["total"][code],
+            )
+            for username, code in self.gifter_codes.items()
+        ]
+
+
+def intern_leaderboard(leaderboard):
+    """Intern the gifter names and images of every ranking of `leaderboard`, in place, and return it."""
+    for ranking in leaderboard.values():
+        for gifter in ranking:
+            for key in ("gifterUsername", "gifterImage"):
+                if key in gifter:
+                    gifter[key] = string_table.intern(gifter[key])
+    return leaderboard
+
+
+async def fetch_gifters_section(username):
+    """
+    Download the `/gifters` page of `username` and return it as a `GiftersSection`.
+
+    The section is stored in the snapshot cache. Raises if the page can't be downloaded or Throne changed its JSON file.
+    """
+    page_props = await fetch_page_props(f"/{username}/gifters")
+
+    # Extract relevant information
+    data = read_gifters_page(username, page_props)
+    raw_json = json_dumps(data)
+    interned_before = string_table.interned_bytes_total
+    section = GiftersSection(
+        initial_counts=data["initialCounts"],
+        user_info=data["userInfo"],
+        previous_gifts=[Gift.from_json(gift) for gift in data["previousGifts"]],
+        leaderboard=intern_leaderboard(data["leaderboard"]),
+        version=content_version(raw_json),
+        fetched_at=time.time(),
+        raw_json_zlib=zlib.compress(raw_json, 1),
+    )
+    section.interned_bytes = string_table.interned_bytes_total - interned_before
+
+    snapshot_cache.set((username, GIFTERS_SECTION), section, section.size())
+    return section
+
+
+async def fetch_wishlist_section(username):
+    """
+    Download the wishlist page of `username` and return it as a `WishlistSection`.
+
+    The section is stored in the snapshot cache. Raises if the page can't be downloaded or Throne changed its JSON file.
+    """
+    page_props = await fetch_page_props(f"/{username}")
+
+    # The creator's ID is needed to find the wishlist, take it from the gifters page if this page lacks it
+    _userInfo = page_props["fallback"].get(f"public/useCreatorByUsername/{username}")
+    if _userInfo is None:
+        _userInfo = (await load_section(username, GIFTERS_SECTION)).user_info
+
+    data = read_wishlist_page(_userInfo["_id"], page_props)
+    raw_json = json_dumps(data)
+    interned_before = string_table.interned_bytes_total
+    section = WishlistSection(
+        wishlist_items=[WishlistItem.from_json(item) for item in data["wishlistItems"]],
+        wishlist_collections=[Collection.from_json(collection) for collection in data["wishlistCollections"]],
+        version=content_version(raw_json),
+        fetched_at=time.time(),
+        raw_json_zlib=zlib.compress(raw_json, 1),
+    )
+    section.interned_bytes = string_table.interned_bytes_total - interned_before
+
+    snapshot_cache.set((username, WISHLIST_SECTION), section, section.size())
+    return section
+
+
+SECTION_FETCHERS = {
+    GIFTERS_SECTION: fetch_gifters_section,
+    WISHLIST_SECTION: fetch_wishlist_section,
+}
+
+# Kinds of failed lookups remembered by the negative cache
+USER_NOT_FOUND = "not_found"
+NO_SECTION_DATA = "no_{section}_data"
+
+
+class ThroneDataError(Exception):
+    """Raised when Throne has no data for a creator: the user doesn't exist or the page has no usable JSON."""
+
+    def __init__(self, kind, message):
+        super().__init__(message)
+        self.kind = kind
+
+
+negative_cache = SnapshotCache(NEGATIVE_CACHE_TTL, 0, NEGATIVE_CACHE_MAX_ENTRIES, NEGATIVE_CACHE_MAX_ENTRIES * 1024)
+
+
+async def fetch_section(username, section):
+    """
+    Fetch the `section` of the snapshot of `username`, remembering in the negative cache why it failed.
+
+    Raises `ThroneDataError` if the user doesn't exist or the page has no usable data, and
+    `httpx.HTTPError` for other upstream failures, which aren't remembered.
+    """
+    try:
+        return await SECTION_FETCHERS[section](username)
+
+    except ThroneDataError:
+        raise
+
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code != 404:
+            raise
+        error = ThroneDataError(USER_NOT_FOUND, f"Throne user {username} not found")
+        negative_cache.set((username, USER_NOT_FOUND), str(error), len(str(error)))
+        raise error from e
+
+    except (ValueError, KeyError, TypeError) as e:
+        # ValueError covers json.JSONDecodeError, raised when the page has no __NEXT_DATA__
+        kind = NO_SECTION_DATA.format(section=section)
+        error = ThroneDataError(kind, f"No {section} data on the Throne page of {username} ({type(e).__name__}: {str(e)})")
+        negative_cache.set((username, kind), str(error), len(str(error)))
+        raise error from e
+
+
+def check_negative_cache(username, section):
+    """Raise `ThroneDataError` if a recent lookup of the `section` of `username` failed for a lasting reason."""
+    for kind in (USER_NOT_FOUND, NO_SECTION_DATA.format(section=section)):
+        entry = negative_cache.get((username, kind))
+        if entry is not None:
+            raise ThroneDataError(kind, entry.value)
+
+
+async def load_section(username, section):
+    """
+    Return the `section` of the snapshot of `username` (lowercased), from the cache when possible.
+
+    Fresh sections are returned as they are. Stale ones are returned right away while a background
+    task refreshes them. Missing ones are fetched, sharing the fetch with concurrent callers.
+    While the circuit breaker of Throne is open, sections past their max stale age are served too.
+    Raises if the section has to be fetched and that fails, and again without fetching it if it is
+    loaded another time during the same request.
+    """
+    key = (username, section)
+    # While Throne is unavailable, even sections past their max stale age are better than an error
+    entry = snapshot_cache.get(key, keep_expired=throne_guard.is_open())
+
+    if entry is None:
+        check_negative_cache(username, section)
+        error = remembered_failure(f"{username}/{section}")
+        if error is not None:
+            raise error
+        try:
+            value = await throne_fetches.do(key, fetch_section, username, section)
+        except Exception as e:
+            remember_failure(f"{username}/{section}", e)
+            raise
+        record_snapshot_age(0, "MISS")
+        record_data_version(f"{username}/{section}", value.version, value.fetched_at)
+        return value
+
+    if snapshot_cache.is_fresh(entry):
+        record_snapshot_age(entry.age, "HIT")
+    else:
+        # Serve the stale section right away and refresh it in the background
+        if key not in throne_fetches.calls:
+            throne_fetches.start(key, fetch_section, username, section).add_done_callback(report_refresh_error)
+        record_snapshot_age(entry.age, "STALE")
+    record_data_version(f"{username}/{section}", entry.value.version, entry.value.fetched_at)
+    return entry.value
+
+
+async def load_snapshot(username, sections=ALL_SECTIONS):
+    """
+    Return the `CreatorSnapshot` of `username` with the given `sections` loaded.
+
+    Only the Throne pages backing those sections are downloaded, all at the same time.
+    Raises if a section can't be loaded.
+    """
+    loaded = await gather_or_cancel(*(load_section(username.lower(), section) for section in sections))
+    return CreatorSnapshot(**dict(zip(sections, loaded)))
+
+
+# Views are keyed by the content version of their data, so they never expire and are only evicted when the cache is full
+view_cache = SnapshotCache(math.inf, 0, VIEW_CACHE_MAX_ENTRIES, VIEW_CACHE_MAX_BYTES)
+
+
+async def view_key(endpoint, params, sections, uses_rates):
+    """
+    Return the key of the view cache under which the response of `endpoint` to `params` is stored,
+    and the versions of the data it was built from, by the names `record_data_version` uses.
+
+    The key holds the content version of the snapshot `sections` the endpoint reads, and the
+    version of the exchange rate table if it converts prices. Returns None if the data can't be
+    loaded, such responses aren't cached and the endpoint reports the error.
+    """
+    username = params["username"].lower()
+    try:
+        snapshot = await load_snapshot(username, sections)
+        rates = await load_rate_table() if uses_rates else None
+    except (httpx.HTTPError, ThroneDataError, RateProviderError, HTTPException):
+        return None
+
+    versions = {f"{username}/{section}": getattr(snapshot, section).version for section in sections}
+    if uses_rates:
+        entry = rate_cache.get(RATE_TABLE_BASE)
+        # No rate table, or the rate cache is disabled and there is no version to key on
+        if rates is None or entry is None:
+            return None
+        versions["rates"] = entry.value.version
+    return (endpoint.__name__, username, tuple(versions.items()), tuple({**params, "username": username}.items())), versions
+
+
+def loaded_versions_match(versions):
+    """Tell whether the data the current request loaded last still has the given `versions`."""
+    context = request_context.get()
+    if context is None:
+        return True
+    loaded = context.get("data_versions", {})
+    return all(loaded.get(name) == version for name, version in versions.items())
+
+
+def cached_view(sections, uses_rates=False):
+    """
+    Cache the encoded responses of the decorated endpoint in the view cache.
+
+    A cached response is served as long as the `sections` of the creator snapshot it was computed
+    from keep the same content and, with `uses_rates`, the exchange rate table isn't refreshed.
+    Errors aren't cached.
+    """
+    def decorator(endpoint):
+        @wraps(endpoint)
+        async def wrapper(**params):
+            found = await view_key(endpoint, params, sections, uses_rates)
+            if found is None:
+                return await endpoint(**params)
+
+            key, versions = found
+            entry = view_cache.get(key)
+            if entry is not None:
+                return Response(entry.value, media_type="application/json")
+
+            response = await endpoint(**params)
+            # The data may have been refreshed while the endpoint ran, then the response isn't the one of the key
+            if isinstance(response, FastJSONResponse) and response.status_code == 200 and loaded_versions_match(versions):
+                view_cache.set(key, response.body, len(response.body))
+            return response
+        return wrapper
+    return decorator
+
+
 @app.get("/get_cleaned", tags=["Raw"], 
     responses={
         200: {
@@ -222,35 +1638,90 @@ async def get_cleaned(
     ```
     """
     try:
-        # Retrieve raw gifted data
-        Gifted = json.loads((await get_raw_gifted(username)).body.decode("utf-8"))
+        snapshot = await load_snapshot(username)
+        # Both sections keep their page as a JSON object, join their members into one object
+        gifters_json, wishlist_json = zlib.decompress(snapshot.gifters.raw_json_zlib), zlib.decompress(snapshot.wishlist.raw_json_zlib)
+        content = gifters_json[:-1] + b"," + wishlist_json[1:]
+        return Response(content, status_code=200, media_type="application/json")
 
-        # Retrieve raw wishlist data
-        Wishlist = json.loads((await get_raw_wishlist(username)).body.decode("utf-8"))
+    except Exception as e:
+        error_message = "Throne API Error: Throne has changed their JSON file, please contact the developer to fix this issue."
+        return HTTPException(status_code=500, detail=str(error_message))
 
-        # Extract relevant information
-        _userInfo = Gifted["props"]["pageProps"]["fallback"][f"public/useCreatorByUsername/{username.lower()}"]
-        _previousGifts = Gifted["props"]["pageProps"]["fallback"][f"public/wishlist/usePreviousGifts/{_userInfo['_id']}"]
-        _leaderboard = Gifted["props"]["pageProps"]["fallback"][f"api-leaderboard/v1/leaderboard/{_userInfo['_id']}"]
-        _initialCounts = Gifted["props"]["pageProps"]["initialCounts"]
-        _wishlistItems = Wishlist["props"]["pageProps"]["fallback"][f"public/wishlist/useWishlistItems/{_userInfo['_id']}"]
-        _wishlistCollections = Wishlist["props"]["pageProps"]["fallback"][f"public/wishlist/useWishlistCollections/{_userInfo['_id']}"]
 
-        # Organize the information
-        output = {
-            "initialCounts": _initialCounts,
-            "userInfo": _userInfo,
-            "previousGifts": _previousGifts,
-            "leaderboard": _leaderboard,
-            "wishlistItems": _wishlistItems,
-            "wishlistCollections": _wishlistCollections
-        }
+@app.delete("/cache", tags=["Cache"],
+    responses={
+        200: {
+            "description": "Successful response with the username whose cached data was dropped",
+            "content": {"application/json": {"example": {"invalidated": "john_doe"}}},
+        },
+    },
+)
+async def invalidate_cache(
+    username: str = Query(None, title="Throne Username",
+                          description="Username of the Throne user to drop from the cache (every user if omitted)"),
+):
+    """
+    Drop cached Throne data so that the next request fetches it again.
 
-        return JSONResponse(output, status_code=200)
+    Parameters:
+    - `username` (str, optional): The username of the Throne user. Every cached user is dropped if omitted.
 
-    except Exception as e:
-        error_message = "Throne API Error: Throne has changed their JSON file, please contact the developer to fix this issue."
-        return HTTPException(status_code=500, detail=str(error_message))
+    Returns:
+    - JSONResponse: A JSON response with the invalidated username, or `"*"` if the whole cache was cleared.
+    """
+    if username:
+        for section in ALL_SECTIONS:
+            snapshot_cache.invalidate((username.lower(), section))
+            negative_cache.invalidate((username.lower(), NO_SECTION_DATA.format(section=section)))
+        negative_cache.invalidate((username.lower(), USER_NOT_FOUND))
+        for key in [key for key in view_cache.entries if key[1] == username.lower()]:
+            view_cache.invalidate(key)
+        return FastJSONResponse({"invalidated": username.lower()}, status_code=200)
+
+    snapshot_cache.invalidate()
+    negative_cache.invalidate()
+    view_cache.invalidate()
+    return FastJSONResponse({"invalidated": "*"}, status_code=200)
+
+
+@app.get("/metrics", tags=["Cache"],
+    responses={
+        200: {
+            "description": "Successful response with the state of the caches",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "snapshotCache": {"entries": 12, "bytes": 10485760},
+                        "negativeCache": {"entries": 3},
+                        "viewCache": {"entries": 40, "bytes": 2097152},
+                        "rateCache": {"entries": 1},
+                        "internTable": {"entries": 5321, "hits": 48210, "savedBytes": 4194304},
+                    }
+                }
+            }
+        },
+    },
+)
+async def get_metrics():
+    """
+    Retrieve the state of the caches, including the memory saved by sharing repeated strings between snapshots.
+
+    Returns:
+    - JSONResponse: A JSON response with the size of every cache. `savedBytes` counts the bytes of
+      the string copies that the cached snapshots share with the intern table instead of holding
+      their own, evicted and replaced snapshots aren't counted. The snapshot cache holds one entry
+      per page of a user, so up to two per user.
+    """
+    output = {
+        "snapshotCache": {"entries": len(snapshot_cache.entries), "bytes": snapshot_cache.size},
+        "negativeCache": {"entries": len(negative_cache.entries)},
+        "viewCache": {"entries": len(view_cache.entries), "bytes": view_cache.size},
+        "rateCache": {"entries": len(rate_cache.entries)},
+        "internTable": {"entries": len(string_table.strings), "hits": string_table.hits,
+                        "savedBytes": sum(entry.value.interned_bytes for entry in snapshot_cache.entries.values())},
+    }
+    return FastJSONResponse(output, status_code=200)
 
 
 @app.get("/user/Info", tags=["User"], 
@@ -297,22 +1768,22 @@ async def get_user_info(
     """
     
     try: 
-        data = json.loads((await get_cleaned(username)).body.decode("utf-8"))
-        userInfo = data["userInfo"]
+        snapshot = await load_snapshot(username, [GIFTERS_SECTION])
+        userInfo = snapshot.user_info
         output = {
             "displayName": userInfo["displayName"],
             "birthday": userInfo["birthday"],
             "bio": userInfo["bio"],
             "createdAt": datetime.fromtimestamp(userInfo["createdAt"]/1000).strftime("%Y-%m-%d %H:%M:%S"),
-            "wishlistItemsCount": data["initialCounts"]["wishlist"],
-            "giftedItemsCount": data["initialCounts"]["previousGifts"],
-            "collectionsCount": data["initialCounts"]["collections"],
+            "wishlistItemsCount": snapshot.initial_counts["wishlist"],
+            "giftedItemsCount": snapshot.initial_counts["previousGifts"],
+            "collectionsCount": snapshot.initial_counts["collections"],
             "username": userInfo["username"],
             "_id": userInfo["_id"],
             "picture": userInfo["pictureUrl"],
             "backgroundPictureUrl": userInfo["backgroundPictureUrl"],
         }
-        return JSONResponse(output, status_code=200)
+        return FastJSONResponse(output, status_code=200)
     
     except Exception as e:
         error_message = f"Throne API Error: {str(e)}"
@@ -356,11 +1827,11 @@ async def get_user_socials(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        userInfo = json.loads((await get_cleaned(username)).body.decode("utf-8"))["userInfo"]
+        userInfo = (await load_snapshot(username, [GIFTERS_SECTION])).user_info
         output = {"mainContentPlatform": userInfo["mainContentPlatform"]}
         for social in userInfo["socialLinks"]:
             output[social["type"]] = {"name": social["name"],"url": social["url"]}
-        return JSONResponse(output, status_code=200)
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve user social links. {str(e)}"
@@ -398,8 +1869,8 @@ async def get_user_categories(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        user_categories = json.loads((await get_cleaned(username)).body.decode("utf-8"))["userInfo"]["surpriseCategories"]
-        return JSONResponse(user_categories, status_code=200)
+        user_categories = (await load_snapshot(username, [GIFTERS_SECTION])).user_info["surpriseCategories"]
+        return FastJSONResponse(user_categories, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve user categories. {str(e)}"
@@ -437,8 +1908,8 @@ async def get_user_interest(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        user_interests = json.loads((await get_cleaned(username)).body.decode("utf-8"))["userInfo"]["interests"]
-        return JSONResponse(user_interests, status_code=200)
+        user_interests = (await load_snapshot(username, [GIFTERS_SECTION])).user_info["interests"]
+        return FastJSONResponse(user_interests, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve user interests. {str(e)}"
@@ -481,10 +1952,10 @@ async def get_collections(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        wishlist_collections = json.loads((await get_cleaned(username)).body.decode("utf-8"))["wishlistCollections"]
+        wishlist_collections = (await load_snapshot(username, [WISHLIST_SECTION])).wishlist_collections
 
-        output = [{"title": collection["title"], "id": collection["id"]} for collection in wishlist_collections]
-        return JSONResponse(output, status_code=200)
+        output = [{"title": collection.title, "id": collection.id} for collection in wishlist_collections]
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve user collections. {str(e)}"
@@ -519,6 +1990,7 @@ async def get_collections(
         }
     }
 )
+@cached_view([WISHLIST_SECTION], uses_rates=True)
 async def get_collections_detailed(
     username: str = Query(..., title="Throne Username", 
                           description="Username of the Throne user"),
@@ -537,50 +2009,38 @@ async def get_collections_detailed(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        data = json.loads((await get_cleaned(username)).body.decode("utf-8"))
-        collections = data["wishlistCollections"]
-        items = data["wishlistItems"]
+        wishlist = (await load_snapshot(username, [WISHLIST_SECTION])).wishlist
+        collections = wishlist.wishlist_collections
         output = []
 
-        for collection in collections:
+        # The totals are computed once per cached wishlist, and valued in USD and the display currency with a single rate lookup
+        collection_totals = [wishlist.collection_totals.get(collection.id, CollectionTotals()) for collection in collections]
+        prices = [totals.prices() for totals in collection_totals]
+        values = await value_price_tables(prices, ["USD", displayCurrency.upper()] if displayCurrency else ["USD"])
+        usd_values = values["USD"]
+
+        for collection, totals, price, usd_value in zip(collections, collection_totals, prices, usd_values):
             collection_output = {
-                "name": collection["title"],
-                "description": collection["description"],
-                "id": collection["id"],
-                "updatedAt": datetime.fromtimestamp(collection["updatedAt"] / 1000).strftime("%Y-%m-%d %H:%M:%S"),
+                "name": collection.title,
+                "description": collection.description,
+                "id": collection.id,
+                "updatedAt": datetime.fromtimestamp(collection.updated_at / 1000).strftime("%Y-%m-%d %H:%M:%S"),
+                "items": totals.items,
+                "individualItems": totals.individual_items,
             }
 
-            collection_id = collection["id"]
-            total_count = 0
-            individual_count = 0
-            price = {}
-
-            for item in items:
-                if collection_id in item["collectionIds"]:
-                    individual_count += 1
-                    total_count += 1 * item["quantity"]
-                    if item["currency"] not in price:
-                        price[item["currency"]] = 0
-                    price[item["currency"]] += (item["price"] / 100) * item["quantity"]
-
-            usd_value = 0
-            collection_output["items"] = total_count
-            collection_output["individualItems"] = individual_count
-
             for currency in price:
-                usd_value += await currency_converter(price[currency], currency.upper(), "USD")
                 collection_output[f"{currency.lower()}_price"] = price[currency]
 
             collection_output["usd_price"] = usd_value
 
-            if displayCurrency:
-                collection_output[f"{displayCurrency.lower()}_price"] = await currency_converter(
-                    usd_value, "USD", displayCurrency.upper()
-                )
-
             output.append(collection_output)
 
-        return JSONResponse(output, status_code=200)
+        if displayCurrency:
+            for collection_output, display_price in zip(output, values[displayCurrency.upper()]):
+                collection_output[f"{displayCurrency.lower()}_price"] = display_price
+
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve detailed collections. {str(e)}"
@@ -636,54 +2096,33 @@ async def get_collection(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        data = json.loads((await get_cleaned(username)).body.decode("utf-8"))
-        collections = data["wishlistCollections"]
-        items = data["wishlistItems"]
-        single_collection = {}
-
-        for collection in collections:
-            if collection["id"] == id:
-                single_collection = collection
-                break
+        wishlist = (await load_snapshot(username, [WISHLIST_SECTION])).wishlist
+        single_collection = wishlist.collections_by_id[id]
 
         output = {
-            "name": single_collection["title"],
-            "description": single_collection["description"],
-            "id": single_collection["id"],
-            "createdAt": datetime.fromtimestamp(single_collection["createdAt"] / 1000).strftime("%Y-%m-%d %H:%M:%S"),
-            "updatedAt": datetime.fromtimestamp(single_collection["updatedAt"] / 1000).strftime("%Y-%m-%d %H:%M:%S"),
-            "image": single_collection["imageSrc"],
+            "name": single_collection.title,
+            "description": single_collection.description,
+            "id": single_collection.id,
+            "createdAt": datetime.fromtimestamp(single_collection.created_at / 1000).strftime("%Y-%m-%d %H:%M:%S"),
+            "updatedAt": datetime.fromtimestamp(single_collection.updated_at / 1000).strftime("%Y-%m-%d %H:%M:%S"),
+            "image": single_collection.image,
         }
 
-        total_count = 0
-        individual_count = 0
-        price = {}
-
-        for item in items:
-            if id in item["collectionIds"]:
-                individual_count += 1
-                total_count += 1 * item["quantity"]
-                if item["currency"] not in price:
-                    price[item["currency"]] = 0
-                price[item["currency"]] += (item["price"] / 100) * item["quantity"]
-
-        output["items"] = total_count
-        output["individualItems"] = individual_count
-
-        usd_price = 0
+        totals = wishlist.collection_totals.get(id, CollectionTotals())
+        price = totals.prices()
+        output["items"] = totals.items
+        output["individualItems"] = totals.individual_items
 
         for currency in price:
-            usd_price += await currency_converter(price[currency], currency.upper(), "USD")
             output[f"{currency.lower()}_price"] = price[currency]
 
-        output["usd_price"] = usd_price
+        values = await value_price_tables([price], ["USD", displayCurrency.upper()] if displayCurrency else ["USD"])
+        output["usd_price"] = values["USD"][0]
 
         if displayCurrency:
-            output[f"{displayCurrency.lower()}_price"] = await currency_converter(
-                usd_price, "USD", displayCurrency.upper()
-            )
+            output[f"{displayCurrency.lower()}_price"] = values[displayCurrency.upper()][0]
 
-        return JSONResponse(output, status_code=200)
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve collection details. {str(e)}"
@@ -734,21 +2173,20 @@ async def get_collection_items(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        items = json.loads((await get_cleaned(username)).body.decode("utf-8"))["wishlistItems"]
+        items = (await load_snapshot(username, [WISHLIST_SECTION])).wishlist.items_by_collection.get(id, [])
         output = []
 
         for item in items:
-            if id in item["collectionIds"]:
-                item_info = {
-                    "name": item["name"],
-                    "quantity": item["quantity"],
-                    "price": item["price"] / 100,
-                    "currency": item["currency"],
-                    "id": item["id"],
-                }
-                output.append(item_info)
+            item_info = {
+                "name": item.name,
+                "quantity": item.quantity,
+                "price": item.price / 100,
+                "currency": item.currency,
+                "id": item.id,
+            }
+            output.append(item_info)
 
-        return JSONResponse(output, status_code=200)
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve collection items. {str(e)}"
@@ -789,10 +2227,10 @@ async def get_items(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        wishlist_items = json.loads((await get_cleaned(username)).body.decode("utf-8"))["wishlistItems"]
-        output = [{"name": item["name"], "id": item["id"]} for item in wishlist_items]
+        wishlist_items = (await load_snapshot(username, [WISHLIST_SECTION])).wishlist_items
+        output = [{"name": item.name, "id": item.id} for item in wishlist_items]
 
-        return JSONResponse(output, status_code=200)
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve wishlist items. {str(e)}"
@@ -848,29 +2286,29 @@ async def get_items_detailed(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        wishlist_items = json.loads((await get_cleaned(username)).body.decode("utf-8"))["wishlistItems"]
+        wishlist_items = (await load_snapshot(username, [WISHLIST_SECTION])).wishlist_items
         output = []
 
         for item in wishlist_items:
             item_info = {
-                "name": item["name"],
-                "id": item["id"],
-                "addedAt": datetime.fromtimestamp(item["createdAt"] / 1000).strftime("%Y-%m-%d %H:%M:%S"),
-                "isDigital": item["isDigitalGood"],
-                "isAvailable": item.get("isAvailable", None),
-                "notInStock": item.get("notInStock", None),
-                "quantity": item["quantity"],
-                f"{item['currency'].lower()}_total": {
-                    "currency": item["currency"],
-                    "price": item["price"] / 100,
-                    "totalPrice": item["price"] / 100 * item["quantity"],
-                    "shipping": item.get("shipping", 0) / 100,
-                    "totalPriceWithShipping": item["price"] * item["quantity"] / 100 + item.get("shipping", 0) / 100,
+                "name": item.name,
+                "id": item.id,
+                "addedAt": datetime.fromtimestamp(item.created_at / 1000).strftime("%Y-%m-%d %H:%M:%S"),
+                "isDigital": item.is_digital,
+                "isAvailable": item.is_available,
+                "notInStock": item.not_in_stock,
+                "quantity": item.quantity,
+                f"{item.currency.lower()}_total": {
+                    "currency": item.currency,
+                    "price": item.price / 100,
+                    "totalPrice": item.price / 100 * item.quantity,
+                    "shipping": item.shipping / 100,
+                    "totalPriceWithShipping": item.price * item.quantity / 100 + item.shipping / 100,
                 },
             }
             output.append(item_info)
 
-        return JSONResponse(output, status_code=200)
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve detailed wishlist items. {str(e)}"
@@ -945,51 +2383,39 @@ async def get_item(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        wishlist_items = json.loads((await get_cleaned(username)).body.decode("utf-8"))["wishlistItems"]
-        single_item = {}
+        single_item = (await load_snapshot(username, [WISHLIST_SECTION])).wishlist.items_by_id[id]
 
-        for item in wishlist_items:
-            if item["id"] == id:
-                single_item = item
-                break
+        local_total = {
+            "price": single_item.price / 100,
+            "totalPrice": single_item.price / 100 * single_item.quantity,
+            "shipping": single_item.shipping / 100,
+            "totalPriceWithShipping": (single_item.price * single_item.quantity / 100) + single_item.shipping / 100,
+        }
+        target_currencies = ["USD", displayCurrency.upper()] if displayCurrency else ["USD"]
+        converted_totals = await convert_amounts(local_total, single_item.currency.upper(), target_currencies)
 
         output = {
-            "name": single_item["name"],
-            "link": single_item.get("link", None),
-            "addedAt": datetime.fromtimestamp(single_item["createdAt"] / 1000).strftime("%Y-%m-%d %H:%M:%S"),
-            "isDigital": single_item["isDigitalGood"],
-            "isAvailable": single_item.get("isAvailable", None),
-            "notInStock": single_item.get("notInStock", None),
-            "quantity": single_item["quantity"],
-            f"{single_item['currency'].lower()}_total": {
-                "currency": single_item["currency"],
-                "price": single_item["price"] / 100,
-                "totalPrice": single_item["price"] / 100 * single_item["quantity"],
-                "shipping": single_item.get("shipping", 0) / 100,
-                "totalPriceWithShipping": (single_item["price"] * single_item["quantity"] / 100) + single_item.get("shipping", 0) / 100,
-            },
-            "usd_total": {
-                "currency": "USD",
-                "price": await currency_converter(single_item["price"] / 100, single_item["currency"].upper(), "USD"),
-                "totalPrice": await currency_converter(single_item["price"] / 100 * single_item["quantity"], single_item["currency"].upper(), "USD"),
-                "shipping": await currency_converter(single_item.get("shipping", 0) / 100, single_item["currency"].upper(), "USD"),
-                "totalPriceWithShipping": await currency_converter((single_item["price"] * single_item["quantity"] / 100) + single_item.get("shipping", 0) / 100, single_item["currency"].upper(), "USD"),
-            },
+            "name": single_item.name,
+            "link": single_item.link,
+            "addedAt": datetime.fromtimestamp(single_item.created_at / 1000).strftime("%Y-%m-%d %H:%M:%S"),
+            "isDigital": single_item.is_digital,
+            "isAvailable": single_item.is_available,
+            "notInStock": single_item.not_in_stock,
+            "quantity": single_item.quantity,
+            f"{single_item.currency.lower()}_total": {"currency": single_item.currency, **local_total},
+            "usd_total": {"currency": "USD", **converted_totals["USD"]},
         }
 
         if displayCurrency:
             output[f"{displayCurrency.lower()}_total"] = {
                 "currency": displayCurrency.upper(),
-                "price": await currency_converter(single_item["price"] / 100, single_item["currency"].upper(), displayCurrency.upper()),
-                "totalPrice": await currency_converter(single_item["price"] / 100 * single_item["quantity"], single_item["currency"].upper(), displayCurrency.upper()),
-                "shipping": await currency_converter(single_item.get("shipping", 0) / 100, single_item["currency"].upper(), displayCurrency.upper()),
-                "totalPriceWithShipping": await currency_converter((single_item["price"] * single_item["quantity"] / 100) + single_item.get("shipping", 0) / 100, single_item["currency"].upper(), displayCurrency.upper()),
+                **converted_totals[displayCurrency.upper()],
             }
 
-        output["image"] = single_item["imgLink"]
-        output["id"] = single_item["id"]
+        output["image"] = single_item.image
+        output["id"] = single_item.id
 
-        return JSONResponse(output, status_code=200)
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve detailed item. {str(e)}"
@@ -1037,14 +2463,14 @@ async def get_previous_gifts(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        previous_gifts = json.loads((await get_cleaned(username)).body.decode("utf-8"))["previousGifts"]
+        previous_gifts = (await load_snapshot(username, [GIFTERS_SECTION])).previous_gifts
         output = []
 
         for gift in previous_gifts:
-            gifters = [{"username": gifter["customerUsername"]} for gifter in gift["customizations"]["customers"]]
-            output.append({"name": gift["name"], "gifters": gifters, "id": gift["id"]})
+            gifters = [{"username": gifter.username} for gifter in gift.customers]
+            output.append({"name": gift.name, "gifters": gifters, "id": gift.id})
 
-        return JSONResponse(output, status_code=200)
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve previous gifts. {str(e)}"
@@ -1097,6 +2523,7 @@ async def get_previous_gifts(
         },
     },
 )
+@cached_view([GIFTERS_SECTION])
 async def get_previous_gifts_detailed(
     username: str = Query(..., title="Throne Username", 
                           description="Username of the Throne user"),
@@ -1112,39 +2539,39 @@ async def get_previous_gifts_detailed(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        previous_gifts = json.loads((await get_cleaned(username)).body.decode("utf-8"))["previousGifts"]
+        previous_gifts = (await load_snapshot(username, [GIFTERS_SECTION])).previous_gifts
         output = []
 
         for gift in previous_gifts:
-            gifters = [{"username": gifter["customerUsername"]} for gifter in gift["customizations"]["customers"]]
+            gifters = [{"username": gifter.username} for gifter in gift.customers]
             output.append({
-                "name": gift["name"],
+                "name": gift.name,
                 "gifters": gifters,
-                "purchasedAt": datetime.fromtimestamp(gift["purchasedAt"]/1000).strftime("%Y-%m-%d %H:%M:%S"),
-                "status": gift["status"],
-                "isComplete": gift["isComplete"],
-                "isDigital": gift["isDigitalGood"],
-                "isCrowdfunded": gift["isCrowdfunded"],
+                "purchasedAt": datetime.fromtimestamp(gift.purchased_at/1000).strftime("%Y-%m-%d %H:%M:%S"),
+                "status": gift.status,
+                "isComplete": gift.is_complete,
+                "isDigital": gift.is_digital,
+                "isCrowdfunded": gift.is_crowdfunded,
                 "local_currency_total": {
-                    "currency": gift["total"]["currency"],
-                    "price": gift["total"]["price"]/100,
-                    "fees": 0 if not gift["total"]["fees"] else gift["total"]["fees"]/100,
-                    "subTotal": 0 if not gift["total"]["subTotal"] else gift["total"]["subTotal"]/100,
-                    "shipping": gift["total"]["shipping"]/100,
-                    "total": 0 if not gift["total"]["total"] else gift["total"]["total"]/100,
+                    "currency": gift.total.currency,
+                    "price": gift.total.price/100,
+                    "fees": 0 if not gift.total.fees else gift.total.fees/100,
+                    "subTotal": 0 if not gift.total.sub_total else gift.total.sub_total/100,
+                    "shipping": gift.total.shipping/100,
+                    "total": 0 if not gift.total.total else gift.total.total/100,
                 },
                 "usd_total": {
                     "currency": "USD",
-                    "price": gift["totalUsd"]["price"]/100,
-                    "fees": 0 if not gift["totalUsd"]["fees"] else gift["totalUsd"]["fees"]/100,
-                    "subTotal": 0 if not gift["totalUsd"]["subTotal"] else gift["totalUsd"]["subTotal"]/100,
-                    "shipping": gift["totalUsd"]["shipping"]/100,
-                    "total": 0 if not gift["totalUsd"]["total"] else gift["totalUsd"]["total"]/100,
+                    "price": gift.total_usd.price/100,
+                    "fees": 0 if not gift.total_usd.fees else gift.total_usd.fees/100,
+                    "subTotal": 0 if not gift.total_usd.sub_total else gift.total_usd.sub_total/100,
+                    "shipping": gift.total_usd.shipping/100,
+                    "total": 0 if not gift.total_usd.total else gift.total_usd.total/100,
                 },
-                "id": gift["id"],
+                "id": gift.id,
             })
 
-        return JSONResponse(output, status_code=200)
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve detailed previous gifts. {str(e)}"
@@ -1226,53 +2653,48 @@ async def get_previous_gift(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        previous_gifts = json.loads((await get_cleaned(username)).body.decode("utf-8"))["previousGifts"]
-        single_gift = next((gift for gift in previous_gifts if gift["id"] == id), None)
+        single_gift = (await load_snapshot(username, [GIFTERS_SECTION])).gifters.gifts_by_id.get(id)
 
         if single_gift:
-            gifters = [{"username": gifter["customerUsername"], "image": gifter["customerImage"]} for gifter in single_gift["customizations"]["customers"]]
+            gifters = [{"username": gifter.username, "image": gifter.image} for gifter in single_gift.customers]
             output = {
-                "name": single_gift["name"],
+                "name": single_gift.name,
                 "gifters": gifters,
-                "purchasedAt": datetime.fromtimestamp(single_gift["purchasedAt"]/1000).strftime("%Y-%m-%d %H:%M:%S"),
-                "status": single_gift["status"],
-                "id": single_gift["id"],
-                "link": single_gift.get("link", None),
-                "image": single_gift["imageSrc"],
-                "isComplete": single_gift["isComplete"],
-                "isDigital": single_gift["isDigitalGood"],
-                "isCrowdfunded": single_gift["isCrowdfunded"],
+                "purchasedAt": datetime.fromtimestamp(single_gift.purchased_at/1000).strftime("%Y-%m-%d %H:%M:%S"),
+                "status": single_gift.status,
+                "id": single_gift.id,
+                "link": single_gift.link,
+                "image": single_gift.image,
+                "isComplete": single_gift.is_complete,
+                "isDigital": single_gift.is_digital,
+                "isCrowdfunded": single_gift.is_crowdfunded,
                 "local_currency_total": {
-                    "currency": single_gift["total"]["currency"],
-                    "price": single_gift["total"]["price"]/100,
-                    "fees": 0 if not single_gift["total"]["fees"] else single_gift["total"]["fees"]/100,
-                    "subTotal": 0 if not single_gift["total"]["subTotal"] else single_gift["total"]["subTotal"]/100,
-                    "shipping": single_gift["total"]["shipping"]/100,
-                    "total": 0 if not single_gift["total"]["total"] else single_gift["total"]["total"]/100,
+                    "currency": single_gift.total.currency,
+                    "price": single_gift.total.price/100,
+                    "fees": 0 if not single_gift.total.fees else single_gift.total.fees/100,
+                    "subTotal": 0 if not single_gift.total.sub_total else single_gift.total.sub_total/100,
+                    "shipping": single_gift.total.shipping/100,
+                    "total": 0 if not single_gift.total.total else single_gift.total.total/100,
                 },
                 "usd_total": {
                     "currency": "USD",
-                    "price": single_gift["totalUsd"]["price"]/100,
-                    "fees": 0 if not single_gift["totalUsd"]["fees"] else single_gift["totalUsd"]["fees"]/100,
-                    "subTotal": 0 if not single_gift["totalUsd"]["subTotal"] else single_gift["totalUsd"]["subTotal"]/100,
-                    "shipping": single_gift["totalUsd"]["shipping"]/100,
-                    "total": 0 if not single_gift["totalUsd"]["total"] else single_gift["totalUsd"]["total"]/100,
+                    "price": single_gift.total_usd.price/100,
+                    "fees": 0 if not single_gift.total_usd.fees else single_gift.total_usd.fees/100,
+                    "subTotal": 0 if not single_gift.total_usd.sub_total else single_gift.total_usd.sub_total/100,
+                    "shipping": single_gift.total_usd.shipping/100,
+                    "total": 0 if not single_gift.total_usd.total else single_gift.total_usd.total/100,
                 },
             }
 
             if displayCurrency:
                 output[f"{displayCurrency.lower()}_total"] = {
                     "currency": displayCurrency.upper(),
-                    "price": await currency_converter(single_gift["totalUsd"]["price"]/100, "USD", displayCurrency.upper()),
-                    "fees": 0 if not single_gift["totalUsd"]["fees"] else await currency_converter(single_gift["totalUsd"]["fees"]/100, "USD", displayCurrency.upper()),
-                    "subTotal": 0 if not single_gift["totalUsd"]["subTotal"] else await currency_converter(single_gift["totalUsd"]["subTotal"]/100, "USD", displayCurrency.upper()),
-                    "shipping": await currency_converter(single_gift["totalUsd"]["shipping"]/100, "USD", displayCurrency.upper()),
-                    "total": 0 if not single_gift["totalUsd"]["total"] else await currency_converter(single_gift["totalUsd"]["total"]/100, "USD", displayCurrency.upper()),
+                    **(await convert_amounts(gift_amounts(single_gift.total_usd), "USD", [displayCurrency.upper()]))[displayCurrency.upper()],
                 }
 
-            return JSONResponse(output, status_code=200)
+            return FastJSONResponse(output, status_code=200)
 
-        return JSONResponse({"detail": "Gift not found"}, status_code=404)
+        return FastJSONResponse({"detail": "Gift not found"}, status_code=404)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve detailed previous gift. {str(e)}"
@@ -1351,50 +2773,45 @@ async def get_latest_gift(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        previous_gifts = json.loads((await get_cleaned(username)).body.decode("utf-8"))["previousGifts"]
-        latest_gift = max(previous_gifts, key=lambda x: x["purchasedAt"])
+        latest_gift = (await load_snapshot(username, [GIFTERS_SECTION])).gifters.gifts_by_date[0]
 
-        gifters = [{"username": gifter["customerUsername"], "image": gifter["customerImage"]} for gifter in latest_gift["customizations"]["customers"]]
+        gifters = [{"username": gifter.username, "image": gifter.image} for gifter in latest_gift.customers]
         output = {
-            "name": latest_gift["name"],
+            "name": latest_gift.name,
             "gifters": gifters,
-            "purchasedAt": datetime.fromtimestamp(latest_gift["purchasedAt"]/1000).strftime("%Y-%m-%d %H:%M:%S"),
-            "status": latest_gift["status"],
-            "id": latest_gift["id"],
-            "link": latest_gift.get("link", None),
-            "image": latest_gift["imageSrc"],
-            "isComplete": latest_gift["isComplete"],
-            "isDigital": latest_gift["isDigitalGood"],
-            "isCrowdfunded": latest_gift["isCrowdfunded"],
+            "purchasedAt": datetime.fromtimestamp(latest_gift.purchased_at/1000).strftime("%Y-%m-%d %H:%M:%S"),
+            "status": latest_gift.status,
+            "id": latest_gift.id,
+            "link": latest_gift.link,
+            "image": latest_gift.image,
+            "isComplete": latest_gift.is_complete,
+            "isDigital": latest_gift.is_digital,
+            "isCrowdfunded": latest_gift.is_crowdfunded,
             "local_currency_total": {
-                "currency": latest_gift["total"]["currency"],
-                "price": latest_gift["total"]["price"]/100,
-                "fees": 0 if not latest_gift["total"]["fees"] else latest_gift["total"]["fees"]/100,
-                "subTotal": 0 if not latest_gift["total"]["subTotal"] else latest_gift["total"]["subTotal"]/100,
-                "shipping": latest_gift["total"]["shipping"]/100,
-                "total": 0 if not latest_gift["total"]["total"] else latest_gift["total"]["total"]/100,
+                "currency": latest_gift.total.currency,
+                "price": latest_gift.total.price/100,
+                "fees": 0 if not latest_gift.total.fees else latest_gift.total.fees/100,
+                "subTotal": 0 if not latest_gift.total.sub_total else latest_gift.total.sub_total/100,
+                "shipping": latest_gift.total.shipping/100,
+                "total": 0 if not latest_gift.total.total else latest_gift.total.total/100,
             },
             "usd_total": {
                 "currency": "USD",
-                "price": latest_gift["totalUsd"]["price"]/100,
-                "fees": 0 if not latest_gift["totalUsd"]["fees"] else latest_gift["totalUsd"]["fees"]/100,
-                "subTotal": 0 if not latest_gift["totalUsd"]["subTotal"] else latest_gift["totalUsd"]["subTotal"]/100,
-                "shipping": latest_gift["totalUsd"]["shipping"]/100,
-                "total": 0 if not latest_gift["totalUsd"]["total"] else latest_gift["totalUsd"]["total"]/100,
+                "price": latest_gift.total_usd.price/100,
+                "fees": 0 if not latest_gift.total_usd.fees else latest_gift.total_usd.fees/100,
+                "subTotal": 0 if not latest_gift.total_usd.sub_total else latest_gift.total_usd.sub_total/100,
+                "shipping": latest_gift.total_usd.shipping/100,
+                "total": 0 if not latest_gift.total_usd.total else latest_gift.total_usd.total/100,
             },
         }
 
         if displayCurrency:
             output[f"{displayCurrency.lower()}_total"] = {
                 "currency": displayCurrency.upper(),
-                "price": await currency_converter(latest_gift["totalUsd"]["price"]/100, "USD", displayCurrency.upper()),
-                "fees": 0 if not latest_gift["totalUsd"]["fees"] else await currency_converter(latest_gift["totalUsd"]["fees"]/100, "USD", displayCurrency.upper()),
-                "subTotal": 0 if not latest_gift["totalUsd"]["subTotal"] else await currency_converter(latest_gift["totalUsd"]["subTotal"]/100, "USD", displayCurrency.upper()),
-                "shipping": await currency_converter(latest_gift["totalUsd"]["shipping"]/100, "USD", displayCurrency.upper()),
-                "total": 0 if not latest_gift["totalUsd"]["total"] else await currency_converter(latest_gift["totalUsd"]["total"]/100, "USD", displayCurrency.upper()),
+                **(await convert_amounts(gift_amounts(latest_gift.total_usd), "USD", [displayCurrency.upper()]))[displayCurrency.upper()],
             }
 
-        return JSONResponse(output, status_code=200)
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve detailed latest gift. {str(e)}"
@@ -1448,25 +2865,16 @@ async def get_total(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        previous_gifts = json.loads((await get_cleaned(username)).body.decode("utf-8"))["previousGifts"]
-
-        nb_gifts = len(previous_gifts)
-        gifters = set()
-        usd_price = 0
-        usd_fees = 0
-        usd_subtotal = 0
-        usd_shipping = 0
-        usd_total = 0
-
-        for gift in previous_gifts:
-            for gifter in gift["customizations"]["customers"]:
-                gifters.add(gifter["customerUsername"])
+        gift_columns = (await load_snapshot(username, [GIFTERS_SECTION])).gifters.gift_columns
+        totals = gift_columns.totals()
 
-            usd_price += gift["totalUsd"]["price"]/100
-            usd_fees += 0 if not gift["totalUsd"]["fees"] else gift["totalUsd"]["fees"]/100
-            usd_subtotal += 0 if not gift["totalUsd"]["subTotal"] else gift["totalUsd"]["subTotal"]/100
-            usd_shipping += gift["totalUsd"]["shipping"]/100
-            usd_total += 0 if not gift["totalUsd"]["total"] else gift["totalUsd"]["total"]/100
+        nb_gifts = len(gift_columns.gifts)
+        gifters = gift_columns.gifter_codes
+        usd_price = 0 if not nb_gifts else totals["price"]/100
+        usd_fees = 0 if not totals["fees"] else totals["fees"]/100
+        usd_subtotal = 0 if not totals["subtotal"] else totals["subtotal"]/100
+        usd_shipping = 0 if not nb_gifts else totals["shipping"]/100
+        usd_total = 0 if not totals["total"] else totals["total"]/100
 
         output = {
             "nbGifts": nb_gifts,
@@ -1479,13 +2887,18 @@ async def get_total(
         }
 
         if displayCurrency:
-            output[f"{displayCurrency.lower()}_price"] = await currency_converter(usd_price, "USD", displayCurrency.upper())
-            output[f"{displayCurrency.lower()}_fees"] = await currency_converter(usd_fees, "USD", displayCurrency.upper())
-            output[f"{displayCurrency.lower()}_subtotal"] = await currency_converter(usd_subtotal, "USD", displayCurrency.upper())
-            output[f"{displayCurrency.lower()}_shipping"] = await currency_converter(usd_shipping, "USD", displayCurrency.upper())
-            output[f"{displayCurrency.lower()}_total"] = await currency_converter(usd_total, "USD", displayCurrency.upper())
+            usd_amounts = {
+                "price": usd_price,
+                "fees": usd_fees,
+                "subtotal": usd_subtotal,
+                "shipping": usd_shipping,
+                "total": usd_total,
+            }
+            display_amounts = (await convert_amounts(usd_amounts, "USD", [displayCurrency.upper()]))[displayCurrency.upper()]
+            for name, amount in display_amounts.items():
+                output[f"{displayCurrency.lower()}_{name}"] = amount
 
-        return JSONResponse(output, status_code=200)
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve total summary of previous gifts. {str(e)}"
@@ -1577,79 +2990,63 @@ async def get_latest_gifter(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        previous_gifts = json.loads((await get_cleaned(username)).body.decode("utf-8"))["previousGifts"]
-        latest_gift = max(previous_gifts, key=lambda gift: gift["purchasedAt"])
+        gifters = (await load_snapshot(username, [GIFTERS_SECTION])).gifters
+        latest_gift = gifters.gifts_by_date[0]
 
         output = []
-        for gifter in latest_gift["customizations"]["customers"]:
+        for gifter in latest_gift.customers:
             gifter_info = {
-                "username": gifter["customerUsername"],
-                "image": gifter["customerImage"],
+                "username": gifter.username,
+                "image": gifter.image,
                 "latestGift": {
-                    "name": latest_gift["name"],
-                    "id": latest_gift["id"],
-                    "purchasedAt": datetime.fromtimestamp(latest_gift["purchasedAt"]/1000).strftime("%Y-%m-%d %H:%M:%S"),
-                    "status": latest_gift["status"],
-                    "isComplete": latest_gift["isComplete"],
-                    "isDigital": latest_gift["isDigitalGood"],
-                    "isCrowdfunded": latest_gift["isCrowdfunded"],
+                    "name": latest_gift.name,
+                    "id": latest_gift.id,
+                    "purchasedAt": datetime.fromtimestamp(latest_gift.purchased_at/1000).strftime("%Y-%m-%d %H:%M:%S"),
+                    "status": latest_gift.status,
+                    "isComplete": latest_gift.is_complete,
+                    "isDigital": latest_gift.is_digital,
+                    "isCrowdfunded": latest_gift.is_crowdfunded,
                     "local_currency_total": {
-                        "currency": latest_gift["total"]["currency"],
-                        "price": latest_gift["total"]["price"]/100,
-                        "fees": 0 if not latest_gift["total"]["fees"] else latest_gift["total"]["fees"]/100,
-                        "subTotal": 0 if not latest_gift["total"]["subTotal"] else latest_gift["total"]["subTotal"]/100,
-                        "shipping": latest_gift["total"]["shipping"]/100,
-                        "total": 0 if not latest_gift["total"]["total"] else latest_gift["total"]["total"]/100,
+                        "currency": latest_gift.total.currency,
+                        "price": latest_gift.total.price/100,
+                        "fees": 0 if not latest_gift.total.fees else latest_gift.total.fees/100,
+                        "subTotal": 0 if not latest_gift.total.sub_total else latest_gift.total.sub_total/100,
+                        "shipping": latest_gift.total.shipping/100,
+                        "total": 0 if not latest_gift.total.total else latest_gift.total.total/100,
                     },
                     "usd_total": {
-                        "currency": latest_gift["totalUsd"]["currency"],
-                        "price": latest_gift["totalUsd"]["price"]/100,
-                        "fees": 0 if not latest_gift["totalUsd"]["fees"] else latest_gift["totalUsd"]["fees"]/100,
-                        "subTotal": 0 if not latest_gift["totalUsd"]["subTotal"] else latest_gift["totalUsd"]["subTotal"]/100,
-                        "shipping": latest_gift["totalUsd"]["shipping"]/100,
-                        "total": 0 if not latest_gift["totalUsd"]["total"] else latest_gift["totalUsd"]["total"]/100,
+                        "currency": latest_gift.total_usd.currency,
+                        "price": latest_gift.total_usd.price/100,
+                        "fees": 0 if not latest_gift.total_usd.fees else latest_gift.total_usd.fees/100,
+                        "subTotal": 0 if not latest_gift.total_usd.sub_total else latest_gift.total_usd.sub_total/100,
+                        "shipping": latest_gift.total_usd.shipping/100,
+                        "total": 0 if not latest_gift.total_usd.total else latest_gift.total_usd.total/100,
                     },
                 }
             }
 
-            summary_info = {
-                "nbGifts": 0,
-                "usd_price": 0,
-                "usd_fees": 0,
-                "usd_subtotal": 0,
-                "usd_shipping": 0,
-                "usd_total": 0,
-            }
-            for gift in previous_gifts:
-                is_gifter = any(_gifter["customerUsername"] == gifter_info["username"] for _gifter in gift["customizations"]["customers"])
-                if is_gifter:
-                    summary_info["nbGifts"] += 1
-                    summary_info["usd_price"] += gift["totalUsd"]["price"]/100
-                    summary_info["usd_fees"] += 0 if not gift["totalUsd"]["fees"] else gift["totalUsd"]["fees"]/100
-                    summary_info["usd_subtotal"] += 0 if not gift["totalUsd"]["subTotal"] else gift["totalUsd"]["subTotal"]/100
-                    summary_info["usd_shipping"] += gift["totalUsd"]["shipping"]/100
-                    summary_info["usd_total"] += 0 if not gift["totalUsd"]["total"] else gift["totalUsd"]["total"]/100
-
-            gifter_info["summary"] = summary_info
+            # Only the gifts of this gifter are visited, thanks to the gifter index
+            gifter_info["summary"] = gifters.gifter_stats(gifter_info["username"]).summary()
 
-            if displayCurrency:
-                gifter_info["latestGift"]["display_currency_total"] = {
-                    "price": await currency_converter(gifter_info["latestGift"]["usd_total"]["price"], "USD", displayCurrency.upper()),
-                    "fees": await currency_converter(gifter_info["latestGift"]["usd_total"]["fees"], "USD", displayCurrency.upper()),
-                    "subTotal": await currency_converter(gifter_info["latestGift"]["usd_total"]["subTotal"], "USD", displayCurrency.upper()),
-                    "shipping": await currency_converter(gifter_info["latestGift"]["usd_total"]["shipping"], "USD", displayCurrency.upper()),
-                    "total": await currency_converter(gifter_info["latestGift"]["usd_total"]["total"], "USD", displayCurrency.upper())
-                }
+            output.append(gifter_info)
 
-                gifter_info["summary"][f"{displayCurrency.lower()}_price"] = await currency_converter(summary_info["usd_price"], "USD", displayCurrency.upper())
-                gifter_info["summary"][f"{displayCurrency.lower()}_fees"] = await currency_converter(summary_info["usd_fees"], "USD", displayCurrency.upper())
-                gifter_info["summary"][f"{displayCurrency.lower()}_subtotal"] = await currency_converter(summary_info["usd_subtotal"], "USD", displayCurrency.upper())
-                gifter_info["summary"][f"{displayCurrency.lower()}_shipping"] = await currency_converter(summary_info["usd_shipping"], "USD", displayCurrency.upper())
-                gifter_info["summary"][f"{displayCurrency.lower()}_total"] = await currency_converter(summary_info["usd_total"], "USD", displayCurrency.upper())
+        if displayCurrency:
+            # Convert the latest gift and the summary of every gifter in a single batch
+            usd_amounts = {
+                "latestGift": gift_amounts(latest_gift.total_usd),
+                "summaries": [
+                    {name: gifter_info["summary"][f"usd_{name}"] for name in ("price", "fees", "subtotal", "shipping", "total")}
+                    for gifter_info in output
+                ],
+            }
+            display_amounts = (await convert_amounts(usd_amounts, "USD", [displayCurrency.upper()]))[displayCurrency.upper()]
 
-            output.append(gifter_info)
+            for gifter_info, summary_amounts in zip(output, display_amounts["summaries"]):
+                gifter_info["latestGift"]["display_currency_total"] = dict(display_amounts["latestGift"])
+                for name, amount in summary_amounts.items():
+                    gifter_info["summary"][f"{displayCurrency.lower()}_{name}"] = amount
 
-        return JSONResponse(output, status_code=200)
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve information about the latest gifters. {str(e)}"
@@ -1694,7 +3091,7 @@ async def get_last_20_gifters(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        last_20_gifters = json.loads((await get_cleaned(username)).body.decode("utf-8"))["leaderboard"]["lastTwentyGifters"]
+        last_20_gifters = (await load_snapshot(username, [GIFTERS_SECTION])).leaderboard["lastTwentyGifters"]
         output = []
         for gifter in last_20_gifters:
             output.append({
@@ -1703,7 +3100,7 @@ async def get_last_20_gifters(
                 "image": gifter["gifterImage"],
             })
 
-        return JSONResponse(output, status_code=200)
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve information about the last 20 gifters. {str(e)}"
@@ -1765,6 +3162,7 @@ async def get_last_20_gifters(
         },
     },
 )
+@cached_view([GIFTERS_SECTION])
 async def get_all_gifters(
     username: str = Query(..., title="Throne Username", 
                           description="Username of the Throne user"),
@@ -1780,85 +3178,29 @@ async def get_all_gifters(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        previous_gifts = json.loads((await get_cleaned(username)).body.decode("utf-8"))["previousGifts"]
+        gift_columns = (await load_snapshot(username, [GIFTERS_SECTION])).gifters.gift_columns
 
-        output = {}
-        for gift in previous_gifts:
-            for gifter in gift["customizations"]["customers"]:
-                if gifter["customerUsername"] not in list(output.keys()):
-                    output[gifter["customerUsername"]] = {
-                        "username": gifter["customerUsername"],
-                        "image": gifter["customerImage"],
-                        "latestGift": {
-                            "name": gift["name"],
-                            "purchasedAt": datetime.fromtimestamp(gift["purchasedAt"]/1000).strftime("%Y-%m-%d %H:%M:%S"),
-                            "status": gift["status"],
-                            "isComplete": gift["isComplete"],
-                            "isDigital": gift["isDigitalGood"],
-                            "isCrowdfunded": gift["isCrowdfunded"],
-                            f"{gift['total']['currency'].lower()}_total": {
-                                "currency": gift["total"]["currency"],
-                                "price": gift["total"]["price"]/100,
-                                "fees": 0 if not gift["total"]["fees"] else gift["total"]["fees"]/100,
-                                "subTotal": 0 if not gift["total"]["subTotal"] else gift["total"]["subTotal"]/100,
-                                "shipping": gift["total"]["shipping"]/100,
-                                "total": 0 if not gift["total"]["total"] else gift["total"]["total"]/100,
-                            },
-                            f"{gift['totalUsd']['currency'].lower()}_total": {
-                                "currency": gift["totalUsd"]["currency"],
-                                "price": gift["totalUsd"]["price"]/100,
-                                "fees": 0 if not gift["totalUsd"]["fees"] else gift["totalUsd"]["fees"]/100,
-                                "subTotal": 0 if not gift["totalUsd"]["subTotal"] else gift["totalUsd"]["subTotal"]/100,
-                                "shipping": gift["totalUsd"]["shipping"]/100,
-                                "total": 0 if not gift["totalUsd"]["total"] else gift["totalUsd"]["total"]/100,
-                            },
-                            "id": gift["id"],
-                        },
-                        "summary": {
-                            "nbGifts": 1,
-                            "usd_price": gift["totalUsd"]["price"]/100,
-                            "usd_fees": 0 if not gift["totalUsd"]["fees"] else gift["totalUsd"]["fees"]/100,
-                            "usd_subtotal": 0 if not gift["totalUsd"]["subTotal"] else gift["totalUsd"]["subTotal"]/100,
-                            "usd_shipping": gift["totalUsd"]["shipping"]/100,
-                            "usd_total": 0 if not gift["totalUsd"]["total"] else gift["totalUsd"]["total"]/100,
-                        },
-                    }
-                else:
-                    output[gifter["customerUsername"]]["summary"]["nbGifts"] += 1
-                    output[gifter["customerUsername"]]["summary"]["usd_price"] += gift["totalUsd"]["price"]/100
-                    output[gifter["customerUsername"]]["summary"]["usd_fees"] += 0 if not gift["totalUsd"]["fees"] else gift["totalUsd"]["fees"]/100
-                    output[gifter["customerUsername"]]["summary"]["usd_subtotal"] += 0 if not gift["totalUsd"]["subTotal"] else gift["totalUsd"]["subTotal"]/100
-                    output[gifter["customerUsername"]]["summary"]["usd_shipping"] += gift["totalUsd"]["shipping"]/100
-                    output[gifter["customerUsername"]]["summary"]["usd_total"] += 0 if not gift["totalUsd"]["total"] else gift["totalUsd"]["total"]/100
-                    
-                    if datetime.strptime(output[gifter["customerUsername"]]["latestGift"]["purchasedAt"], "%Y-%m-%d %H:%M:%S") < datetime.fromtimestamp(gift["purchasedAt"]/1000):
-                        output[gifter["customerUsername"]]["latestGift"] = {
-                            "name": gift["name"],
-                            "purchasedAt": datetime.fromtimestamp(gift["purchasedAt"]/1000).strftime("%Y-%m-%d %H:%M:%S"),
-                            "status": gift["status"],
-                            "isComplete": gift["isComplete"],
-                            "isDigital": gift["isDigitalGood"],
-                            "isCrowdfunded": gift["isCrowdfunded"],
-                            f"{gift['total']['currency'].lower()}_total": {
-                                "currency": gift["total"]["currency"],
-                                "price": gift["total"]["price"]/100,
-                                "fees": 0 if not gift["total"]["fees"] else gift["total"]["fees"]/100,
-                                "subTotal": 0 if not gift["total"]["subTotal"] else gift["total"]["subTotal"]/100,
-                                "shipping": gift["total"]["shipping"]/100,
-                                "total": 0 if not gift["total"]["total"] else gift["total"]["total"]/100,
-                            },
-                            f"{gift['totalUsd']['currency'].lower()}_total": {
-                                "currency": gift["totalUsd"]["currency"],
-                                "price": gift["totalUsd"]["price"]/100,
-                                "fees": 0 if not gift["totalUsd"]["fees"] else gift["totalUsd"]["fees"]/100,
-                                "subTotal": 0 if not gift["totalUsd"]["subTotal"] else gift["totalUsd"]["subTotal"]/100,
-                                "shipping": gift["totalUsd"]["shipping"]/100,
-                                "total": 0 if not gift["totalUsd"]["total"] else gift["totalUsd"]["total"]/100,
-                            },
-                            "id": gift["id"],
-                        }
+        output = []
+        for gifter_stats in gift_columns.gifter_stats():
+            gift = gifter_stats.latest_gift
+            output.append({
+                "username": gifter_stats.username,
+                "image": gifter_stats.image,
+                "latestGift": {
+                    "name": gift.name,
+                    "purchasedAt": datetime.fromtimestamp(gift.purchased_at/1000).strftime("%Y-%m-%d %H:%M:%S"),
+                    "status": gift.status,
+                    "isComplete": gift.is_complete,
+                    "isDigital": gift.is_digital,
+                    "isCrowdfunded": gift.is_crowdfunded,
+                    f"{gift.total.currency.lower()}_total": {"currency": gift.total.currency, **gift_amounts(gift.total)},
+                    f"{gift.total_usd.currency.lower()}_total": {"currency": gift.total_usd.currency, **gift_amounts(gift.total_usd)},
+                    "id": gift.id,
+                },
+                "summary": gifter_stats.summary(),
+            })
 
-        return JSONResponse(list(output.values()), status_code=200)
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve information about all gifters. {str(e)}"
@@ -1910,7 +3252,7 @@ async def get_leaderboard(
     - HTTPException: An exception with a 500 status code and an error message if there is an issue with the request.
     """
     try:
-        leaderboard = json.loads((await get_cleaned(username)).body.decode("utf-8"))["leaderboard"]
+        leaderboard = (await load_snapshot(username, [GIFTERS_SECTION])).leaderboard
         output = []
 
         if time == "all":
@@ -1940,7 +3282,7 @@ async def get_leaderboard(
         else:
             return PlainTextResponse("Invalid time period", status_code=400)
 
-        return JSONResponse(output, status_code=200)
+        return FastJSONResponse(output, status_code=200)
 
     except Exception as e:
         error_message = f"Throne API Error: Unable to retrieve leaderboard information. {str(e)}"
@@ -1966,9 +3308,7 @@ async def test(
     display_currency: str = Query(None, title="Display Currency", description="Additional currency to display the value in")
 ):
     try:
-        # Assuming get_cleaned and currency_converter are asynchronous functions
-        data = await get_cleaned(username)
-        data = json.loads(data.body.decode("utf-8"))
+        await load_snapshot(username)
 
         if display_currency:
             # Assuming currency_converter is an asynchronous function
@@ -2032,27 +3372,301 @@ async def ping_throne():
             PingInfo["details"]["rtt_min"] = response.rtt_min
             PingInfo["details"]["rtt_max"] = response.rtt_max
             PingInfo["averagePingTime"] = response.rtt_avg_ms
-            return JSONResponse(content=PingInfo, media_type="application/json")
+            return FastJSONResponse(content=PingInfo, media_type="application/json")
     except Exception as e:
         print(f"An error occurred: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
-async def currency_converter(amount, from_currency, to_currency):
-    # API endpoint to get exchange rates
-    endpoint = f"https://api.exchangerate-api.com/v4/latest/{from_currency}"
+RATE_TABLE_BASE = "USD"
+
+
+class RateProviderError(Exception):
+    """Raised by a rate provider that can't provide exchange rates."""
 
-    # Send a GET request to the API
-    response = requests.get(endpoint)
 
-    # Check if the request was successful
-    if response.status_code == 200:
-        data = response.json()
-        # Get the exchange rate for the target currency
-        exchange_rate = data['rates'][to_currency]
+def rebase_rates(rates, base):
+    """Return `rates`, a table of exchange rates relative to any currency, relative to `base` instead."""
+    if base not in rates:
+        raise RateProviderError(f"No exchange rate for {base}")
+    base_rate = rates[base]
+    if not isinstance(base_rate, (int, float)) or not base_rate > 0:
+        raise RateProviderError(f"Invalid exchange rate for {base}: {base_rate!r}")
+    try:
+        return {currency: rate / base_rate for currency, rate in rates.items()}
+    except TypeError as e:
+        raise RateProviderError(f"Invalid exchange rate table: {str(e)}") from e
+
+
+class HttpRateProvider:
+    """Exchange rates from an HTTP API answering like exchangerate-api.com (`GET <url>/<base>`)."""
+
+    def __init__(self, url):
+        self.url = url
+
+    def version(self):
+        return None
+
+    async def fetch_rates(self, base):
+        # Send a GET request to the API
+        try:
+            response = await upstream_get(f"{self.url}/{base}")
+        except httpx.HTTPError as e:
+            raise RateProviderError(f"Exchange rate API request error: {str(e)}") from e
+
+        # Check if the request was successful
+        if response.status_code != 200:
+            raise RateProviderError(f"Exchange rate API answered with status {response.status_code}")
+        try:
+            rates = json_loads(response.content)["rates"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise RateProviderError(f"Exchange rate API answered with an invalid body: {type(e).__name__}: {str(e)}") from e
+        if not isinstance(rates, dict):
+            raise RateProviderError("Exchange rate API answered without a rate table")
+        return rates
+
+
+class FileRateProvider:
+    """
+    Exchange rates from a local file, reloaded whenever it changes.
+
+    JSON files hold either the answer of the HTTP API (`{"base": ..., "rates": {...}}`) or just the
+    rates. CSV files hold one `currency,rate` row per currency. Rates can be relative to any currency.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rates = None
+        self.loaded_version = None
+
+    def version(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def read(self):
+        with open(self.path, "rb") as file:
+            content = file.read()
+
+        if self.path.lower().endswith(".csv"):
+            rates = {}
+            for line in content.decode("utf-8").splitlines():
+                fields = [field.strip() for field in line.split(",")]
+                if len(fields) == 2 and fields[0] and fields[0].lower() != "currency":
+                    rates[fields[0].upper()] = float(fields[1])
+            return rates
+
+        data = json_loads(content)
+        rates = data.get("rates", data) if isinstance(data, dict) else None
+        if not isinstance(rates, dict):
+            raise RateProviderError(f"Exchange rate file {self.path} does not hold a rate table")
+        return rates
+
+    async def fetch_rates(self, base):
+        version = self.version()
+        if version is None:
+            raise RateProviderError(f"Exchange rate file {self.path} is missing")
+
+        if version != self.loaded_version:
+            try:
+                self.rates = self.read()
+            except (OSError, ValueError) as e:
+                raise RateProviderError(f"Unable to read exchange rate file {self.path}: {str(e)}") from e
+            self.loaded_version = version
+        return rebase_rates(self.rates, base)
+
+
+class StaticRateProvider:
+    """Exchange rates from a fixed table, as a last resort."""
+
+    def __init__(self, rates):
+        self.rates = rates
+
+    def version(self):
+        return None
+
+    async def fetch_rates(self, base):
+        return rebase_rates(self.rates, base)
+
+
+class FailoverRateProvider:
+    """Exchange rates from the first of `providers` able to provide them."""
+
+    def __init__(self, providers):
+        self.providers = providers
+
+    def version(self):
+        return tuple(provider.version() for provider in self.providers)
+
+    async def fetch_rates(self, base):
+        errors = []
+        for provider in self.providers:
+            try:
+                return await provider.fetch_rates(base)
+            except RateProviderError as e:
+                errors.append(str(e))
+        raise RateProviderError("; ".join(errors) or "No exchange rate provider configured")
+
+
+def build_rate_provider(names):
+    """Build the provider chain named by `names`, a comma separated list of "http", "file" and "static"."""
+    factories = {
+        "http": lambda: HttpRateProvider(EXCHANGE_RATE_URL),
+        "file": lambda: FileRateProvider(EXCHANGE_RATE_FILE),
+        "static": lambda: StaticRateProvider(json.loads(EXCHANGE_RATE_STATIC)),
+    }
+    providers = []
+    for name in names.split(","):
+        name = name.strip().lower()
+        if name not in factories:
+            raise ValueError(f"Unknown exchange rate provider: {name}")
+        providers.append(factories[name]())
+    return FailoverRateProvider(providers)
+
+
+rate_provider = build_rate_provider(RATE_PROVIDERS)
+rate_cache = SnapshotCache(EXCHANGE_RATE_TTL, EXCHANGE_RATE_MAX_STALE, max_entries=1, max_bytes=1024 * 1024)
+
+
+@dataclass
+class RateTable:
+    """Exchange rates fetched from the rate providers, with the version of the provider they came from and of their content."""
+    provider_version: object
+    rates: dict
+    version: str
+    fetched_at: float
+
+
+async def fetch_rate_table():
+    """
+    Fetch the USD exchange rate table from the rate providers, store it in the rate cache and return it as a `RateTable`.
+
+    Returns None if no provider could provide it.
+    """
+    provider_version = rate_provider.version()
+    try:
+        rates = await rate_provider.fetch_rates(RATE_TABLE_BASE)
+    except RateProviderError as e:
+        print(f"An error occurred while fetching exchange rates: {e}")
+        return None
+
+    table = RateTable(provider_version, rates, content_version(json_dumps(rates)), time.time())
+    rate_cache.set(RATE_TABLE_BASE, table, len(rates))
+    return table
+
+
+async def load_rate_table():
+    """
+    Return the USD exchange rate table, from the cache when possible.
+
+    A stale table is returned right away while a background task refreshes it, and a table read
+    from a rate file that changed since is fetched again, keeping the cached table if that fails.
+    Returns None if no table is cached and no provider could provide it. A fetch that failed isn't
+    tried again during the same request.
+    """
+    entry = rate_cache.get(RATE_TABLE_BASE)
+
+    if entry is None or entry.value.provider_version != rate_provider.version():
+        table = None
+        if remembered_failure("rates") is None:
+            # Concurrent lookups share one request
+            try:
+                table = await rate_fetches.do(RATE_TABLE_BASE, fetch_rate_table)
+            except httpx.TimeoutException:
+                # The deadline of the request was reached, the fetch goes on for the next lookups
+                pass
+            if table is None:
+                remember_failure("rates", RateProviderError("No exchange rate provider could provide the rates"))
+        if table is None:
+            if entry is None:
+                return None
+            # The rate file changed but can't be used, keep the rates read before
+            table = entry.value
+    else:
+        table = entry.value
+        if not rate_cache.is_fresh(entry) and RATE_TABLE_BASE not in rate_fetches.calls:
+            rate_fetches.start(RATE_TABLE_BASE, fetch_rate_table).add_done_callback(report_refresh_error)
+
+    record_data_version("rates", table.version, table.fetched_at)
+    return table.rates
+
+
+async def currency_converter(amount, from_currency, to_currency):
+    rates = await load_rate_table()
+
+    if rates is not None and from_currency in rates:
+        # Derive the exchange rate from the USD rates of both currencies
+        exchange_rate = rates[to_currency] / rates[from_currency]
 
         # Calculate the converted amount
         converted_amount = amount * exchange_rate
         return converted_amount
     else:
         return "Error: Unable to fetch data from the API"
+
+
+def map_amounts(amounts, fn):
+    """Apply `fn` to every amount of `amounts`, a number or a list or dict of (nested) amounts, keeping its shape."""
+    if isinstance(amounts, dict):
+        return {key: map_amounts(value, fn) for key, value in amounts.items()}
+    if isinstance(amounts, (list, tuple)):
+        return [map_amounts(value, fn) for value in amounts]
+    return fn(amounts)
+
+
+async def convert_amounts(amounts, from_currency, to_currencies):
+    """
+    Convert a whole block of amounts in `from_currency` to every currency of `to_currencies` with one rate lookup.
+
+    `amounts` is a number, or a list or dict of (nested) amounts. Returns a dict mapping each target
+    currency to the converted block, which has the same shape as `amounts`. If the rates are
+    unavailable, every converted amount is the error message `currency_converter` would return.
+    """
+    rates = await load_rate_table()
+
+    output = {}
+    for to_currency in to_currencies:
+        if rates is not None and from_currency in rates:
+            exchange_rate = rates[to_currency] / rates[from_currency]
+            output[to_currency] = map_amounts(amounts, lambda amount: amount * exchange_rate)
+        else:
+            output[to_currency] = map_amounts(amounts, lambda amount: "Error: Unable to fetch data from the API")
+    return output
+
+
+async def value_price_tables(price_tables, to_currencies):
+    """
+    Return the total value of every table of `price_tables`, which map currencies to amounts, in every currency of `to_currencies` with one rate lookup.
+
+    Returns a dict mapping each target currency to the list of values, in the order of `price_tables`.
+    Raises `RateProviderError` if the rates are unavailable or miss one of the currencies.
+    """
+    rates = await load_rate_table()
+    if rates is None:
+        raise RateProviderError("Unable to fetch exchange rates")
+    for currency in [*to_currencies, *{currency.upper() for price_table in price_tables for currency in price_table}]:
+        if currency not in rates:
+            raise RateProviderError(f"No exchange rate for {currency}")
+
+    output = {}
+    for to_currency in to_currencies:
+        values = []
+        for price_table in price_tables:
+            value = 0
+            for currency, amount in price_table.items():
+                value += amount * (rates[to_currency] / rates[currency.upper()])
+            values.append(value)
+        output[to_currency] = values
+    return output
+
+
+def gift_amounts(total):
+    """Return the amounts of a gift's `total` or `totalUsd` block in currency units, missing amounts being 0."""
+    return {
+        "price": total.price/100,
+        "fees": 0 if not total.fees else total.fees/100,
+        "subTotal": 0 if not total.sub_total else total.sub_total/100,
+        "shipping": total.shipping/100,
+        "total": 0 if not total.total else total.total/100,
+    }
@@ -0,0 +1,64 @@
+"""
+Time the summaries computed from the columnar gift history against plain Python loops over the gifts.
+
+Usage:
+    python benchmarks/gift_columns.py [--gifts 20000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ThroneAPI  # noqa: E402
+from sample_data import make_gifters_page_props  # noqa: E402
+
+
+def legacy_totals(previous_gifts):
+    """The previous `/previousGifts/total` loop."""
+    gifters = set()
+    totals = {"price": 0, "fees": 0, "subtotal": 0, "shipping": 0, "total": 0}
+    for gift in previous_gifts:
+        for gifter in gift["customizations"]["customers"]:
+            gifters.add(gifter["customerUsername"])
+        totals["price"] += gift["totalUsd"]["price"]/100
+        totals["fees"] += 0 if not gift["totalUsd"]["fees"] else gift["totalUsd"]["fees"]/100
+        totals["subtotal"] += 0 if not gift["totalUsd"]["subTotal"] else gift["totalUsd"]["subTotal"]/100
+        totals["shipping"] += gift["totalUsd"]["shipping"]/100
+        totals["total"] += 0 if not gift["totalUsd"]["total"] else gift["totalUsd"]["total"]/100
+    return len(gifters), totals
+
+
+def best_of(fn, repeat):
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gifts", type=int, default=20000, help="number of previous gifts on the sample page")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed runs, the best one is reported")
+    args = parser.parse_args()
+
+    page_props = make_gifters_page_props("sample_creator", n_gifts=args.gifts)
+    raw_gifts = page_props["fallback"]["public/wishlist/usePreviousGifts/sample_creator-id"]
+    previous_gifts = [ThroneAPI.Gift.from_json(gift) for gift in raw_gifts]
+    print(f"Sample history: {args.gifts} gifts, NumPy {'installed' if ThroneAPI.np is not None else 'not installed'}")
+    print()
+
+    build_ms = best_of(lambda: ThroneAPI.GiftColumns(previous_gifts), args.repeat)
+    gift_columns = ThroneAPI.GiftColumns(previous_gifts)
+    rows = [
+        ("totals", lambda: legacy_totals(raw_gifts), gift_columns.totals),
+        ("per gifter", lambda: ThroneAPI.aggregate_gifters(previous_gifts), gift_columns.gifter_stats),
+    ]
+    print(f"Building the columns (once per snapshot): {build_ms:.2f} ms")
+    print(f"{'':12}{'loop (ms)':>12}{'columns (ms)':>14}{'speedup':>10}")
+    for name, loop, columnar in rows:
+        loop_ms = best_of(loop, args.repeat)
+        columnar_ms = best_of(columnar, args.repeat)
+        print(f"{name:12}{loop_ms:12.3f}{columnar_ms:14.3f}{loop_ms / columnar_ms:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Compare the single-pass `/gifters/all` aggregation with the quadratic loop it replaced, on growing numbers of gifts,
+and with the same request answered from the view cache.
+
+Usage:
+    python benchmarks/gifters_all.py [--gifts 1000 5000 10000 20000] [--repeat 3]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ThroneAPI  # noqa: E402
+from sample_data import make_gifters_page_props  # noqa: E402
+
+
+def money_block(total):
+    return {
+        "currency": total["currency"],
+        "price": total["price"]/100,
+        "fees": 0 if not total["fees"] else total["fees"]/100,
+        "subTotal": 0 if not total["subTotal"] else total["subTotal"]/100,
+        "shipping": total["shipping"]/100,
+        "total": 0 if not total["total"] else total["total"]/100,
+    }
+
+
+def latest_gift_block(gift):
+    return {
+        "name": gift["name"],
+        "purchasedAt": datetime.fromtimestamp(gift["purchasedAt"]/1000).strftime("%Y-%m-%d %H:%M:%S"),
+        "status": gift["status"],
+        "isComplete": gift["isComplete"],
+        "isDigital": gift["isDigitalGood"],
+        "isCrowdfunded": gift["isCrowdfunded"],
+        f"{gift['total']['currency'].lower()}_total": money_block(gift["total"]),
+        f"{gift['totalUsd']['currency'].lower()}_total": money_block(gift["totalUsd"]),
+        "id": gift["id"],
+    }
+
+
+def legacy_all_gifters(previous_gifts):
+    """The previous implementation: a list of the gifters is rebuilt for every gift, and dates are parsed back from strings."""
+    output = {}
+    for gift in previous_gifts:
+        for gifter in gift["customizations"]["customers"]:
+            if gifter["customerUsername"] not in list(output.keys()):
+                summary = money_block(gift["totalUsd"])
+                output[gifter["customerUsername"]] = {
+                    "username": gifter["customerUsername"],
+                    "image": gifter["customerImage"],
+                    "latestGift": latest_gift_block(gift),
+                    "summary": {
+                        "nbGifts": 1,
+                        "usd_price": summary["price"],
+                        "usd_fees": summary["fees"],
+                        "usd_subtotal": summary["subTotal"],
+                        "usd_shipping": summary["shipping"],
+                        "usd_total": summary["total"],
+                    },
+                }
+            else:
+                summary = money_block(gift["totalUsd"])
+                gifter_output = output[gifter["customerUsername"]]
+                gifter_output["summary"]["nbGifts"] += 1
+                gifter_output["summary"]["usd_price"] += summary["price"]
+                gifter_output["summary"]["usd_fees"] += summary["fees"]
+                gifter_output["summary"]["usd_subtotal"] += summary["subTotal"]
+                gifter_output["summary"]["usd_shipping"] += summary["shipping"]
+                gifter_output["summary"]["usd_total"] += summary["total"]
+                if datetime.strptime(gifter_output["latestGift"]["purchasedAt"], "%Y-%m-%d %H:%M:%S") < datetime.fromtimestamp(gift["purchasedAt"]/1000):
+                    gifter_output["latestGift"] = latest_gift_block(gift)
+    return list(output.values())
+
+
+def cache_sample(username, n_gifts):
+    """Put a synthetic `/gifters` section in the snapshot cache of ThroneAPI and return its previous gifts, as raw JSON."""
+    page_props = make_gifters_page_props(username, n_gifts=n_gifts)
+    fallback = page_props["fallback"]
+    section = ThroneAPI.GiftersSection(
+        initial_counts=page_props["initialCounts"],
+        user_info=fallback[f"public/useCreatorByUsername/{username}"],
+        previous_gifts=[ThroneAPI.Gift.from_json(gift) for gift in fallback[f"public/wishlist/usePreviousGifts/{username}-id"]],
+        leaderboard=fallback[f"api-leaderboard/v1/leaderboard/{username}-id"],
+        version=f"{username}-v1",
+    )
+    ThroneAPI.snapshot_cache.set((username, ThroneAPI.GIFTERS_SECTION), section, 0)
+    return fallback[f"public/wishlist/usePreviousGifts/{username}-id"]
+
+
+def best_of(fn, repeat):
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gifts", type=int, nargs="+", default=[1000, 5000, 10000, 20000], help="numbers of previous gifts to aggregate")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed runs, the best one is reported")
+    args = parser.parse_args()
+
+    # Gifters are a fifth of the gifts, as on the sample pages
+    print(f"{'gifts':>8}{'gifters':>10}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}{'cached (ms)':>14}")
+    loop = asyncio.new_event_loop()
+    for n_gifts in args.gifts:
+        username = f"benchmark_{n_gifts}"
+        previous_gifts = cache_sample(username, n_gifts)
+        n_gifters = len({gifter["customerUsername"] for gift in previous_gifts for gifter in gift["customizations"]["customers"]})
+
+        # Both sides include rendering the JSON response, the new one is the endpoint itself, reading the snapshot cache
+        before_ms = best_of(lambda: ThroneAPI.FastJSONResponse(legacy_all_gifters(previous_gifts)), args.repeat)
+        after_ms = best_of(lambda: loop.run_until_complete(ThroneAPI.get_all_gifters.__wrapped__(username=username)), args.repeat)
+        # The decorated endpoint renders the response once, then answers from the view cache
+        cached_ms = best_of(lambda: loop.run_until_complete(ThroneAPI.get_all_gifters(username=username)), args.repeat)
+        print(f"{n_gifts:>8}{n_gifters:>10}{before_ms:14.1f}{after_ms:14.1f}{before_ms / after_ms:9.1f}x{cached_ms:14.3f}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Compare the stdlib JSON codec with the one ThroneAPI picked (orjson when it is installed).
+
+Usage:
+    python benchmarks/json_codec.py [--gifts 5000] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+
+import ThroneAPI  # noqa: E402
+from sample_data import make_gifters_page_props  # noqa: E402
+
+
+def best_of(fn, repeat):
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gifts", type=int, default=5000, help="number of previous gifts on the sample page")
+    parser.add_argument("--repeat", type=int, default=20, help="number of timed runs, the best one is reported")
+    args = parser.parse_args()
+
+    next_data = {"props": {"pageProps": make_gifters_page_props(n_gifts=args.gifts)}, "buildId": "benchmark"}
+    raw = json.dumps(next_data).encode("utf-8")
+    print(f"Sample page: {args.gifts} gifts, {len(raw) / 1024 / 1024:.1f} MiB of JSON")
+    print(f"ThroneAPI JSON backend: {ThroneAPI.JSON_BACKEND}")
+    print()
+
+    rows = [
+        ("parse", lambda: json.loads(raw), lambda: ThroneAPI.json_loads(raw)),
+        ("render", lambda: JSONResponse(next_data), lambda: ThroneAPI.FastJSONResponse(next_data)),
+    ]
+    print(f"{'':8}{'stdlib (ms)':>14}{ThroneAPI.JSON_BACKEND + ' (ms)':>14}{'speedup':>10}")
+    for name, stdlib, selected in rows:
+        stdlib_ms = best_of(stdlib, args.repeat)
+        selected_ms = best_of(selected, args.repeat)
+        print(f"{name:8}{stdlib_ms:14.2f}{selected_ms:14.2f}{stdlib_ms / selected_ms:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Synthetic Throne data shaped like the `pageProps` of real creator pages, for the benchmarks.
+"""
+import random
+
+CURRENCIES = ["USD", "EUR", "GBP", "CAD"]
+STATUSES = ["delivered", "shipped", "processing"]
+
+
+def make_money(rnd, currency):
+    price = rnd.randint(100, 20000)
+    fees = rnd.choice([0, None, rnd.randint(10, 900)])
+    shipping = rnd.randint(0, 1500)
+    return {
+        "currency": currency,
+        "price": price,
+        "fees": fees,
+        "subTotal": price + (fees or 0),
+        "shipping": shipping,
+        "total": price + (fees or 0) + shipping,
+    }
+
+
+def make_gift(rnd, index, gifters):
+    customers = [
+        {
+            "customerUsername": gifter,
+            "customerImage": f"https://thronecdn.com/users/{gifter}.jpg",
+            "message": "Happy streaming!" if rnd.random() < 0.3 else None,
+        }
+        for gifter in rnd.sample(gifters, rnd.choice([1, 1, 1, 2, 3]))
+    ]
+    return {
+        "id": f"gift-{index:08d}",
+        "name": f"Gift number {index}",
+        "purchasedAt": 1650000000000 + rnd.randint(0, 60_000_000_000),
+        "status": rnd.choice(STATUSES),
+        "isComplete": rnd.random() < 0.7,
+        "isDigitalGood": rnd.random() < 0.2,
+        "isCrowdfunded": rnd.random() < 0.1,
+        "imageSrc": f"https://thronecdn.com/wishlistItems/gift-{index:08d}.jpg",
+        "link": f"https://example.com/products/{index}",
+        "total": make_money(rnd, rnd.choice(CURRENCIES)),
+        "totalUsd": make_money(rnd, "USD"),
+        "customizations": {"customers": customers, "isAnonymous": False},
+        "description": "A thoughtful gift picked from the wishlist. " * 3,
+        "vendor": {"name": "Example Store", "country": "US", "logo": "https://thronecdn.com/vendors/example.png"},
+        "shippingInfo": {"carrier": "UPS", "trackingUrl": f"https://ups.example/track/{index}"},
+    }
+
+
+def make_item(rnd, index, collection_ids):
+    item = {
+        "id": f"item-{index:06d}",
+        "name": f"Wishlist item {index}",
+        "quantity": rnd.randint(1, 3),
+        "price": rnd.randint(100, 50000),
+        "currency": rnd.choice(CURRENCIES).lower(),
+        "collectionIds": rnd.sample(collection_ids, rnd.randint(0, min(2, len(collection_ids)))),
+        "createdAt": 1650000000000 + index * 60000,
+        "isDigitalGood": rnd.random() < 0.2,
+        "imgLink": f"https://thronecdn.com/wishlistItems/item-{index:06d}.jpg",
+        "link": f"https://example.com/products/item-{index}",
+        "description": "An item the creator would love to receive. " * 2,
+    }
+    if rnd.random() < 0.7:
+        item["shipping"] = rnd.randint(0, 1500)
+    if rnd.random() < 0.5:
+        item["isAvailable"] = True
+        item["notInStock"] = False
+    return item
+
+
+def make_gifters_page_props(username="sample_creator", n_gifts=5000, n_gifters=None, seed=0):
+    """Return the `pageProps` of the `/gifters` page of a creator with `n_gifts` previous gifts."""
+    rnd = random.Random(seed)
+    n_gifters = n_gifters or max(1, n_gifts // 5)
+    gifters = [f"gifter_{i}" for i in range(n_gifters)] + ["Anonymous"]
+    user_id = f"{username}-id"
+    user_info = {
+        "_id": user_id,
+        "username": username,
+        "displayName": username.title(),
+        "birthday": {"month": 1, "day": 1},
+        "bio": "Sample creator",
+        "createdAt": 1600000000000,
+        "pictureUrl": f"https://thronecdn.com/users/{username}.jpg",
+        "backgroundPictureUrl": f"https://thronecdn.com/user-cover-pictures/{username}.jpg",
+        "mainContentPlatform": "twitch",
+        "socialLinks": [{"type": "twitch", "name": "Twitch", "url": f"https://twitch.tv/{username}"}],
+        "surpriseCategories": ["books", "games"],
+        "interests": ["art"],
+    }
+
+    def leaderboard(size):
+        return [
+            {
+                "gifterUsername": gifter,
+                "gifterImage": f"https://thronecdn.com/users/{gifter}.jpg",
+                "totalPaymentNumber": rnd.randint(1, 50),
+                "totalAmountSpentUSD": rnd.randint(100, 500000),
+                "purchasedAt": 1650000000000 + rnd.randint(0, 60_000_000_000),
+            }
+            for gifter in gifters[:size]
+        ]
+
+    return {
+        "initialCounts": {"wishlist": 0, "previousGifts": n_gifts, "collections": 0},
+        "fallback": {
+            f"public/useCreatorByUsername/{username}": user_info,
+            f"public/wishlist/usePreviousGifts/{user_id}": [make_gift(rnd, i, gifters) for i in range(n_gifts)],
+            f"api-leaderboard/v1/leaderboard/{user_id}": {
+                "lastTwentyGifters": leaderboard(20),
+                "leaderboardAllTime": leaderboard(100),
+                "leaderboardLastWeek": leaderboard(10),
+                "leaderboardLastMonth": leaderboard(30),
+            },
+        },
+    }
+
+
+def make_wishlist_page_props(username="sample_creator", n_items=500, n_collections=20, seed=0):
+    """Return the `pageProps` of the wishlist page of a creator with `n_items` items."""
+    rnd = random.Random(seed)
+    user_id = f"{username}-id"
+    collections = [
+        {
+            "id": f"collection-{i:04d}",
+            "title": f"Collection {i}",
+            "description": f"Collection number {i}",
+            "createdAt": 1640000000000 + i,
+            "updatedAt": 1650000000000 + i,
+            "imageSrc": f"https://thronecdn.com/wishlistCollections/collection-{i:04d}.jpg",
+        }
+        for i in range(n_collections)
+    ]
+    collection_ids = [collection["id"] for collection in collections]
+    return {
+        "initialCounts": {"wishlist": n_items, "previousGifts": 0, "collections": n_collections},
+        "fallback": {
+            f"public/useCreatorByUsername/{username}": {"_id": user_id, "username": username},
+            f"public/wishlist/useWishlistItems/{user_id}": [make_item(rnd, i, collection_ids) for i in range(n_items)],
+            f"public/wishlist/useWishlistCollections/{user_id}": collections,
+        },
+    }
@@ -0,0 +1,82 @@
+"""
+Measure the memory one cached creator takes, with the raw Throne JSON kept as parsed and with the compact records
+(plus the pages kept as compressed JSON for `/get_cleaned`).
+
+Usage:
+    python benchmarks/snapshot_memory.py [--gifts 5000] [--items 500]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ThroneAPI  # noqa: E402
+from sample_data import make_gifters_page_props, make_wishlist_page_props  # noqa: E402
+
+
+def raw_sections(gifters_json, wishlist_json):
+    """What the cache held before: the lists of the parsed JSON, with every field."""
+    gifters = ThroneAPI.read_gifters_page("sample_creator", ThroneAPI.json_loads(gifters_json))
+    wishlist = ThroneAPI.read_wishlist_page("sample_creator-id", ThroneAPI.json_loads(wishlist_json))
+    return gifters["previousGifts"], wishlist["wishlistItems"], wishlist["wishlistCollections"]
+
+
+def compact_sections(gifters_json, wishlist_json):
+    """What the cache holds now: the records built at ingest, and both pages as compressed JSON."""
+    gifters = ThroneAPI.read_gifters_page("sample_creator", ThroneAPI.json_loads(gifters_json))
+    wishlist = ThroneAPI.read_wishlist_page("sample_creator-id", ThroneAPI.json_loads(wishlist_json))
+    records = (
+        [ThroneAPI.Gift.from_json(gift) for gift in gifters["previousGifts"]],
+        [ThroneAPI.WishlistItem.from_json(item) for item in wishlist["wishlistItems"]],
+        [ThroneAPI.Collection.from_json(collection) for collection in wishlist["wishlistCollections"]],
+    )
+    return records, (zlib.compress(ThroneAPI.json_dumps(gifters), 1), zlib.compress(ThroneAPI.json_dumps(wishlist), 1))
+
+
+def retained_bytes(build, *args):
+    """Return what `build(*args)` returns and the memory it keeps allocated once built."""
+    gc.collect()
+    tracemalloc.start()
+    value = build(*args)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gifts", type=int, default=5000, help="number of previous gifts of the sample creator")
+    parser.add_argument("--items", type=int, default=500, help="number of wishlist items of the sample creator")
+    args = parser.parse_args()
+
+    gifters_json = json.dumps(make_gifters_page_props("sample_creator", n_gifts=args.gifts)).encode("utf-8")
+    wishlist_json = json.dumps(make_wishlist_page_props("sample_creator", n_items=args.items)).encode("utf-8")
+    print(f"Sample creator: {args.gifts} gifts, {args.items} items, {(len(gifters_json) + len(wishlist_json)) / 1024 / 1024:.1f} MiB of JSON")
+    print()
+
+    raw, raw_size = retained_bytes(raw_sections, gifters_json, wishlist_json)
+    del raw
+    compact, compact_size = retained_bytes(compact_sections, gifters_json, wishlist_json)
+
+    start = time.perf_counter()
+    records, raw_pages = compact
+    estimated_size = sum(ThroneAPI.estimate_list_size(section) for section in records) + sum(sys.getsizeof(page) for page in raw_pages)
+    estimate_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Raw JSON dicts:   {raw_size / 1024 / 1024:8.2f} MiB")
+    print(f"Compact records:  {compact_size / 1024 / 1024:8.2f} MiB ({raw_size / compact_size:.1f}x smaller)")
+    print(f"Size estimate:    {estimated_size / 1024 / 1024:8.2f} MiB, computed in {estimate_ms:.1f} ms")
+    print()
+    print(f"Creators whose data fits in {ThroneAPI.SNAPSHOT_CACHE_MAX_BYTES // 1024 // 1024} MiB of memory: "
+          f"{ThroneAPI.SNAPSHOT_CACHE_MAX_BYTES // raw_size} before, {ThroneAPI.SNAPSHOT_CACHE_MAX_BYTES // compact_size} now")
+
+
+if __name__ == "__main__":
+    main()
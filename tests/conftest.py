@@ -0,0 +1,100 @@
+"""
+Stub upstreams shared by the tests: a Throne website serving the pages of one creator, and the
+exchange rate API. Both answer through an `httpx.MockTransport`, so nothing leaves the process.
+"""
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import ThroneAPI  # noqa: E402
+from sample_data import make_gifters_page_props, make_wishlist_page_props  # noqa: E402
+
+RATES = {"USD": 1, "EUR": 0.5, "GBP": 0.25, "CAD": 1.25}
+
+
+class StubUpstreams:
+    """
+    Throne and the exchange rate API, counting the requests each path gets.
+
+    `status` makes every answer of an upstream an error with that status, `failures` makes that
+    many of its next answers 503 errors, and `delay` makes it answer that many seconds late. They
+    are keyed by "throne" or "rates".
+    """
+
+    def __init__(self, username="alice"):
+        self.pages = {
+            f"/{username}/gifters": make_gifters_page_props(username, n_gifts=50),
+            f"/{username}": make_wishlist_page_props(username, n_items=20, n_collections=3),
+        }
+        self.rates = dict(RATES)
+        self.status = {}
+        self.failures = {}
+        self.delay = {}
+        self.requests = []
+
+    def count(self, path):
+        return self.requests.count(path)
+
+    async def handle(self, request):
+        upstream = "throne" if str(request.url).startswith(ThroneAPI.THRONE_URL) else "rates"
+        self.requests.append(request.url.path)
+        if self.delay.get(upstream):
+            await asyncio.sleep(self.delay[upstream])
+        if self.status.get(upstream):
+            return httpx.Response(self.status[upstream], text="Unavailable")
+        if self.failures.get(upstream):
+            self.failures[upstream] -= 1
+            return httpx.Response(503, text="Unavailable")
+
+        if upstream == "rates":
+            return httpx.Response(200, json={"base": "USD", "rates": self.rates})
+        page_props = self.pages.get(request.url.path)
+        if page_props is None:
+            return httpx.Response(404, text="Not found")
+        next_data = json.dumps({"buildId": "build-1", "props": {"pageProps": page_props}})
+        return httpx.Response(200, text=f'<html><script id="__NEXT_DATA__" type="application/json">{next_data}</script></html>')
+
+
+def new_guard(name):
+    return ThroneAPI.UpstreamGuard(name, ThroneAPI.UPSTREAM_MAX_CONCURRENCY, ThroneAPI.UPSTREAM_QUEUE_TIMEOUT,
+                                   ThroneAPI.CIRCUIT_FAILURE_THRESHOLD, ThroneAPI.CIRCUIT_RESET_TIMEOUT)
+
+
+@pytest.fixture
+def upstreams(monkeypatch):
+    """Route every upstream request of ThroneAPI to fresh stubs, with empty caches and closed circuit breakers."""
+    stub = StubUpstreams()
+    monkeypatch.setattr(ThroneAPI, "http_client", httpx.AsyncClient(transport=httpx.MockTransport(stub.handle)))
+    monkeypatch.setattr(ThroneAPI, "THRONE_FETCH_MODE", "html")
+    monkeypatch.setattr(ThroneAPI, "RETRY_BASE_DELAY", 0.01)
+    monkeypatch.setattr(ThroneAPI, "throne_guard", new_guard("Throne"))
+    monkeypatch.setattr(ThroneAPI, "rate_guard", new_guard("The exchange rate API"))
+    monkeypatch.setattr(ThroneAPI, "rate_provider", ThroneAPI.build_rate_provider("http"))
+    monkeypatch.setattr(ThroneAPI, "throne_fetches", ThroneAPI.SingleFlight())
+    monkeypatch.setattr(ThroneAPI, "rate_fetches", ThroneAPI.SingleFlight())
+    for cache in (ThroneAPI.snapshot_cache, ThroneAPI.negative_cache, ThroneAPI.view_cache, ThroneAPI.rate_cache):
+        cache.invalidate()
+    return stub
+
+
+async def call_api(path, headers=None, method="GET"):
+    """Send a request for `path` to the ThroneAPI app and return its response."""
+    transport = httpx.ASGITransport(app=ThroneAPI.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        return await client.request(method, path, headers=headers)
+
+
+def get(path, headers=None):
+    return asyncio.run(call_api(path, headers))
+
+
+def delete(path):
+    return asyncio.run(call_api(path, method="DELETE"))
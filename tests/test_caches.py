@@ -0,0 +1,56 @@
+"""
+Tests of the snapshot cache and of what `/metrics` reports about it.
+"""
+import ThroneAPI
+from conftest import delete, get
+
+
+def refresh_gifters():
+    ThroneAPI.snapshot_cache.invalidate(("alice", ThroneAPI.GIFTERS_SECTION))
+    get("/user/Info?username=alice")
+    return get("/metrics").json()["internTable"]["savedBytes"]
+
+
+def test_saved_bytes_follow_the_cached_snapshots(upstreams):
+    get("/user/Info?username=alice")
+    assert get("/metrics").json()["internTable"]["savedBytes"] > 0
+
+    # Refreshing the same creator replaces its savings instead of adding to them
+    saved_bytes = refresh_gifters()
+    assert refresh_gifters() == saved_bytes
+    assert refresh_gifters() == saved_bytes
+
+    delete("/cache?username=alice")
+    assert get("/metrics").json()["internTable"]["savedBytes"] == 0
+
+
+def test_unknown_users_are_answered_from_the_negative_cache(upstreams):
+    paths = ["/user/Info?username=bob", "/items?username=bob"]
+    for path in paths:
+        assert "status_code" in get(path).json()
+    requests_made = len(upstreams.requests)
+    assert requests_made > 0
+
+    for path in paths:
+        assert "status_code" in get(path).json()
+    assert len(upstreams.requests) == requests_made
+
+
+def test_etag_answers_304_until_the_data_changes(upstreams):
+    response = get("/previousGifts?username=alice")
+    etag = response.headers["ETag"]
+    assert get("/previousGifts?username=alice", {"If-None-Match": etag}).status_code == 304
+
+    upstreams.pages["/alice/gifters"]["initialCounts"]["previousGifts"] += 1
+    ThroneAPI.snapshot_cache.invalidate(("alice", ThroneAPI.GIFTERS_SECTION))
+    response = get("/previousGifts?username=alice", {"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_errors_get_no_etag(upstreams):
+    upstreams.status["throne"] = 503
+
+    response = get("/previousGifts?username=alice")
+    assert "status_code" in response.json()
+    assert "ETag" not in response.headers
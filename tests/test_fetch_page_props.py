@@ -0,0 +1,83 @@
+"""
+Tests of `fetch_page_props` against a stub Throne server: the Next.js data route, the re-detection
+of the build ID when the data route answers 404, and the HTML pages.
+
+Usage:
+    python -m pytest tests
+"""
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ThroneAPI  # noqa: E402
+
+
+class StubThrone:
+    """Throne website serving one page, as HTML and from the data route of its current build."""
+
+    def __init__(self, build_id, page_props):
+        self.build_id = build_id
+        self.page_props = page_props
+        self.requests = []
+
+    def html_page(self):
+        next_data = json.dumps({"buildId": self.build_id, "props": {"pageProps": self.page_props}})
+        return f'<html><body><script id="__NEXT_DATA__" type="application/json">{next_data}</script></body></html>'
+
+    def handle(self, request):
+        self.requests.append(request.url.path)
+        if request.url.path.startswith("/_next/data/"):
+            if request.url.path != f"/_next/data/{self.build_id}/alice/gifters.json":
+                return httpx.Response(404)
+            return httpx.Response(200, json={"pageProps": self.page_props})
+        return httpx.Response(200, text=self.html_page())
+
+
+@pytest.fixture
+def throne(monkeypatch):
+    stub = StubThrone("build-1", {"initialCounts": {"gifts": 1}})
+    monkeypatch.setattr(ThroneAPI, "http_client", httpx.AsyncClient(transport=httpx.MockTransport(stub.handle)))
+    monkeypatch.setattr(ThroneAPI, "throne_build_id", None)
+    monkeypatch.setattr(ThroneAPI, "THRONE_FETCH_MODE", "data")
+    return stub
+
+
+def fetch(page_path):
+    return asyncio.run(ThroneAPI.fetch_page_props(page_path))
+
+
+def test_data_route_is_used_once_the_build_id_is_known(throne):
+    assert fetch("/alice/gifters") == throne.page_props
+    assert throne.requests == ["/alice/gifters"]
+    assert ThroneAPI.throne_build_id == "build-1"
+
+    assert fetch("/alice/gifters") == throne.page_props
+    assert throne.requests[1:] == ["/_next/data/build-1/alice/gifters.json"]
+
+
+def test_new_build_is_detected_when_the_data_route_answers_404(throne):
+    fetch("/alice/gifters")
+    throne.build_id = "build-2"
+    throne.page_props = {"initialCounts": {"gifts": 2}}
+
+    assert fetch("/alice/gifters") == throne.page_props
+    assert throne.requests[1:] == ["/_next/data/build-1/alice/gifters.json", "/alice/gifters"]
+    assert ThroneAPI.throne_build_id == "build-2"
+
+    fetch("/alice/gifters")
+    assert throne.requests[3:] == ["/_next/data/build-2/alice/gifters.json"]
+
+
+def test_html_mode_always_scrapes_the_page(throne, monkeypatch):
+    monkeypatch.setattr(ThroneAPI, "THRONE_FETCH_MODE", "html")
+
+    assert fetch("/alice/gifters") == throne.page_props
+    assert fetch("/alice/gifters") == throne.page_props
+    assert throne.requests == ["/alice/gifters", "/alice/gifters"]
+    assert ThroneAPI.throne_build_id is None
@@ -0,0 +1,41 @@
+"""
+Tests of the exchange rate providers and of the failover between them.
+"""
+import asyncio
+
+import pytest
+
+import ThroneAPI
+from conftest import RATES, get
+
+
+@pytest.mark.parametrize("content", ['[1, 2]', '42', '{"rates": [1, 2]}', '{"base": "USD", "rates": 3}'])
+def test_a_rates_file_without_a_rate_table_fails_over(tmp_path, content):
+    path = tmp_path / "rates.json"
+    path.write_text(content)
+    provider = ThroneAPI.FailoverRateProvider([ThroneAPI.FileRateProvider(str(path)),
+                                               ThroneAPI.StaticRateProvider({"USD": 1, "EUR": 0.5})])
+
+    assert asyncio.run(provider.fetch_rates("USD")) == {"USD": 1, "EUR": 0.5}
+
+
+def test_a_rates_file_is_rebased(tmp_path):
+    path = tmp_path / "rates.json"
+    path.write_text('{"base": "EUR", "rates": {"EUR": 1, "USD": 2}}')
+
+    assert asyncio.run(ThroneAPI.FileRateProvider(str(path)).fetch_rates("USD")) == {"EUR": 0.5, "USD": 1}
+
+
+def test_collection_is_valued_in_every_currency_with_one_rate_lookup(upstreams, monkeypatch):
+    lookups = []
+    load_rate_table = ThroneAPI.load_rate_table
+
+    async def counted_load_rate_table():
+        lookups.append(1)
+        return await load_rate_table()
+
+    monkeypatch.setattr(ThroneAPI, "load_rate_table", counted_load_rate_table)
+    output = get("/collections/Collection?username=alice&id=collection-0000&displayCurrency=eur").json()
+
+    assert len(lookups) == 1
+    assert output["eur_price"] == pytest.approx(output["usd_price"] * RATES["EUR"])
@@ -0,0 +1,28 @@
+"""
+Tests of the records built from the Throne pages when Throne leaves fields out of them.
+"""
+from conftest import get
+
+
+def drop_fields(page_props, fields):
+    """Remove `fields` from every record of the lists of `page_props`."""
+    for records in page_props["fallback"].values():
+        if isinstance(records, list):
+            for record in records:
+                for field in fields:
+                    record.pop(field, None)
+
+
+def test_a_missing_field_only_fails_the_endpoints_reading_it(upstreams):
+    for page_props in upstreams.pages.values():
+        drop_fields(page_props, ["imageSrc", "imgLink", "isDigitalGood", "description"])
+
+    for path in ["/items", "/previousGifts", "/collections", "/user/Info", "/gifters/last20"]:
+        response = get(f"{path}?username=alice")
+        assert isinstance(response.json(), list) or "status_code" not in response.json(), path
+
+    assert get("/items/Detailed?username=alice").json()["detail"].endswith("'isDigitalGood'")
+    assert get("/collections/Detailed?username=alice").json()["detail"].endswith("'description'")
+    assert get("/previousGifts/Detailed?username=alice").json()["detail"].endswith("'isDigitalGood'")
+    assert upstreams.count("/alice") == 1
+    assert upstreams.count("/alice/gifters") == 1
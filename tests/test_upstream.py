@@ -0,0 +1,63 @@
+"""
+Tests of the upstream requests behind the cached endpoints: retries, deadlines and shared fetches.
+"""
+import asyncio
+import time
+
+import ThroneAPI
+from conftest import call_api, get
+
+
+def test_retries_of_a_shared_fetch_are_reported_to_every_caller(upstreams):
+    upstreams.failures["throne"] = 1
+
+    async def two_requests():
+        return await asyncio.gather(call_api("/user/Info?username=alice"), call_api("/previousGifts?username=alice"))
+
+    responses = asyncio.run(two_requests())
+    assert [response.status_code for response in responses] == [200, 200]
+    assert [response.headers["X-Upstream-Retries"] for response in responses] == ["1", "1"]
+    # The failed attempt and the retry, shared by both requests
+    assert upstreams.count("/alice/gifters") == 2
+
+
+def test_request_deadline_limits_the_wait_for_a_shared_fetch(upstreams, monkeypatch):
+    monkeypatch.setattr(ThroneAPI, "REQUEST_DEADLINE", 0.5)
+    upstreams.delay["throne"] = 3
+
+    start = time.monotonic()
+    response = get("/gifters/all?username=alice")
+    assert time.monotonic() - start < 1.5
+    assert int(response.headers["X-Upstream-Timeouts"]) >= 1
+    assert "status_code" in response.json()
+
+
+def test_concurrent_requests_for_a_creator_share_one_fetch(upstreams):
+    upstreams.delay["throne"] = 0.1
+
+    async def five_requests():
+        return await asyncio.gather(*(call_api("/user/Info?username=alice") for _ in range(5)))
+
+    responses = asyncio.run(five_requests())
+    assert [response.status_code for response in responses] == [200] * 5
+    assert upstreams.count("/alice/gifters") == 1
+
+
+def test_circuit_breaker_recovers_through_a_probe(upstreams, monkeypatch):
+    guard = ThroneAPI.UpstreamGuard("Throne", 10, 5, failure_threshold=2, reset_timeout=0.2)
+    monkeypatch.setattr(ThroneAPI, "throne_guard", guard)
+    upstreams.status["throne"] = 503
+
+    assert "status_code" in get("/user/Info?username=alice").json()
+    assert guard.is_open()
+    # Requests fail right away while the circuit is open
+    requests_made = upstreams.count("/alice/gifters")
+    assert "status_code" in get("/user/Info?username=alice").json()
+    assert upstreams.count("/alice/gifters") == requests_made
+
+    # Once the reset timeout has passed, a successful probe closes the circuit
+    del upstreams.status["throne"]
+    time.sleep(0.25)
+    assert get("/user/Info?username=alice").json()["displayName"] == "Alice"
+    assert not guard.is_open()
+    assert upstreams.count("/alice/gifters") == requests_made + 1
@@ -0,0 +1,39 @@
+"""
+Tests of the view cache of the heaviest endpoints.
+"""
+import ThroneAPI
+from conftest import get
+
+
+def test_cached_view_is_served_until_the_data_changes(upstreams):
+    first = get("/gifters/all?username=alice")
+    assert get("/gifters/all?username=Alice").content == first.content
+    assert upstreams.count("/alice/gifters") == 1
+    assert len(ThroneAPI.view_cache.entries) == 1
+
+    # A refresh bringing the same data keeps the view, one bringing new data misses it
+    ThroneAPI.snapshot_cache.invalidate(("alice", ThroneAPI.GIFTERS_SECTION))
+    get("/gifters/all?username=alice")
+    assert len(ThroneAPI.view_cache.entries) == 1
+    upstreams.pages["/alice/gifters"]["initialCounts"]["previousGifts"] += 1
+    ThroneAPI.snapshot_cache.invalidate(("alice", ThroneAPI.GIFTERS_SECTION))
+    get("/gifters/all?username=alice")
+    assert len(ThroneAPI.view_cache.entries) == 2
+
+
+def test_failing_cached_view_fetches_the_page_once_per_attempt(upstreams):
+    upstreams.status["throne"] = 503
+
+    response = get("/gifters/all?username=alice")
+    assert "status_code" in response.json()
+    # The attempts of a single load, the endpoint doesn't load the page again after the view cache
+    assert upstreams.count("/alice/gifters") == ThroneAPI.UPSTREAM_MAX_ATTEMPTS
+    assert not ThroneAPI.throne_guard.is_open()
+
+
+def test_failing_rate_api_is_called_once_per_attempt_by_a_cached_view(upstreams):
+    upstreams.status["rates"] = 503
+
+    response = get("/collections/Detailed?username=alice")
+    assert "status_code" in response.json()
+    assert upstreams.count("/v4/latest/USD") == ThroneAPI.UPSTREAM_MAX_ATTEMPTS